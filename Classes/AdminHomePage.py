@@ -6,6 +6,9 @@ from tkcalendar import DateEntry
 from datetime import datetime
 import re
 
+# Rows of the statistics list fetched at a time
+STATS_PAGE_SIZE = 100
+
 class AdminHomePage:
     """
     A class representing the admin home page of the application.
@@ -531,22 +534,59 @@ class AdminHomePage:
         # Add a scrollbar
         scrollbar = ttk.Scrollbar(view_window, orient="vertical", command=tree.yview)
         scrollbar.pack(side='right', fill='y')
-        tree.configure(yscrollcommand=scrollbar.set)
 
-        # Fetch and display all stats
-        stats = self.student_db.fetch_all_stats()
-        for stat in stats:
-            tree.insert("", "end", values=stat)
+        # Stats are fetched a page at a time, newest first, as the list is scrolled
+        listing = {"after": None, "done": False, "prefix": "", "start": None, "end": None, "search_job": None}
 
-        # Add search functionality
-        def search_stats(event):
-            query = search_var.get().lower()
+        def load_page():
+            if listing["done"]:
+                return
+            rows = self.student_db.fetch_stats_page(
+                listing["after"], listing["prefix"], listing["start"], listing["end"], STATS_PAGE_SIZE
+            )
+            for row in rows:
+                tree.insert("", "end", values=row)
+            listing["done"] = len(rows) < STATS_PAGE_SIZE
+            if rows:
+                listing["after"] = (rows[-1][4], rows[-1][0])
+
+        def reload():
             tree.delete(*tree.get_children())
-            for stat in stats:
-                if query in str(stat[1]).lower():  # Search in StudentID
-                    tree.insert("", "end", values=stat)
-
-        search_var.trace_add("write", lambda name, index, mode, sv=search_var: search_stats(None))
+            listing["after"] = None
+            listing["done"] = False
+            load_page()
+            tree.yview_moveto(0)
+
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            # Fetch the next page when the bottom of the list comes into view
+            if float(last) > 0.9:
+                load_page()
+
+        tree.configure(yscrollcommand=on_scroll)
+        load_page()
+
+        # Add search functionality: filter by StudentID prefix once typing pauses
+        def search_stats():
+            listing["search_job"] = None
+            listing["prefix"] = search_var.get().strip()
+            reload()
+
+        def schedule_search():
+            if listing["search_job"] is not None:
+                view_window.after_cancel(listing["search_job"])
+            listing["search_job"] = view_window.after(300, search_stats)
+
+        search_var.trace_add("write", lambda name, index, mode, sv=search_var: schedule_search())
+
+        # Filter the list by the selected dates, or show every date again
+        def filter_dates(start=None, end=None):
+            listing["start"] = start
+            listing["end"] = end
+            reload()
+
+        Button(search_frame, text="Filter Dates", command=lambda: filter_dates(start_date.get_date(), end_date.get_date())).grid(row=1, column=5, padx=10, pady=5)
+        Button(search_frame, text="All Dates", command=filter_dates).grid(row=1, column=6, padx=10, pady=5)
 
         # Display aggregated stats
         agg_stats = self.student_db.fetch_aggregated_stats()
@@ -153,7 +153,7 @@ class ChooseStory:
         self.master.withdraw()
         reading_window = Toplevel(self.master)
         from ReadingSession import ReadingSession
-        reading_session = ReadingSession(body, reading_window)
+        reading_session = ReadingSession(body, reading_window, story_id=story_id)
 
     def previous_page(self):
         """
@@ -0,0 +1,183 @@
+import sqlite3
+import threading
+from pathlib import Path
+from DatabaseMigrations import MIGRATIONS, migrate
+
+DATABASE_FOLDER = Path(__file__).parent.parent / "Database"
+
+
+class ConnectionManager:
+    """
+    Process-wide pool of SQLite connections, one per database file per thread.
+
+    Every DatabaseManager and StoryDatabaseManager on a thread shares the same
+    connection to its database instead of opening its own, so screens no longer
+    leak handles and each connection's prepared statement cache stays warm for
+    the life of the app. Connections are never shared between threads, which lets
+    background workers (for example the transcription queue) read and write
+    safely. Every connection gets the same PRAGMAs.
+
+    The first time a database is opened in the process its folder is created if
+    missing, it is switched to WAL journaling, so readers such as the admin
+    dashboards never block a session writing its stats and vice versa, and its
+    schema is brought up to date with DatabaseMigrations.
+    """
+
+    READ_DATABASE = DATABASE_FOLDER / "READ_Database.db"
+    STORY_DATABASE = DATABASE_FOLDER / "tinystories.db"
+
+    PRAGMAS = {
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,  # Wait up to 5 s for another connection's write lock
+        "synchronous": "NORMAL",  # Safe with WAL; only the last commits can be lost on power failure
+        "cache_size": -8000,  # 8 MB page cache
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    }
+    JOURNAL_MODE = "WAL"
+    CACHED_STATEMENTS = 256  # Prepared statements kept per connection
+
+    _lock = threading.Lock()
+    _setup_lock = threading.Lock()
+    _connections = {}  # (database path, thread) -> connection
+    _handles = {}  # database path -> managers currently holding a connection
+    _prepared = set()  # database paths already switched to WAL and migrated
+    _stats = {"opened": 0, "reused": 0, "closed": 0}
+
+    @staticmethod
+    def _key(db_path):
+        return str(Path(db_path).resolve())
+
+    @classmethod
+    def get_connection(cls, db_path):
+        """
+        Get this thread's connection to a database, opening it the first time.
+
+        Args:
+            db_path (str or Path): Path of the SQLite database file.
+
+        Returns:
+            sqlite3.Connection: The connection, owned by the calling thread.
+        """
+        key = (cls._key(db_path), threading.current_thread())
+        connection = cls._connections.get(key)
+        if connection is not None:
+            cls._stats["reused"] += 1
+            return connection
+
+        if key[0] not in cls._prepared:
+            # The first connection to a database in the process creates its folder
+            Path(key[0]).parent.mkdir(parents=True, exist_ok=True)
+        # check_same_thread is off only so close_all() can close every thread's
+        # connection at exit; each connection is still handed to one thread only
+        connection = sqlite3.connect(
+            db_path, check_same_thread=False, cached_statements=cls.CACHED_STATEMENTS
+        )
+        try:
+            for name, value in cls.PRAGMAS.items():
+                connection.execute(f"PRAGMA {name} = {value}")
+            cls._prepare(connection, key[0])
+        except sqlite3.Error:
+            connection.close()
+            raise
+        with cls._lock:
+            cls._prune()
+            cls._connections[key] = connection
+            cls._stats["opened"] += 1
+        return connection
+
+    @classmethod
+    def acquire(cls, db_path):
+        """
+        Get this thread's connection and count a handle on the database.
+
+        Every acquire() should be paired with a release() once the caller is done.
+
+        Args:
+            db_path (str or Path): Path of the SQLite database file.
+
+        Returns:
+            sqlite3.Connection: The connection, owned by the calling thread.
+        """
+        connection = cls.get_connection(db_path)
+        with cls._lock:
+            key = cls._key(db_path)
+            cls._handles[key] = cls._handles.get(key, 0) + 1
+        return connection
+
+    @classmethod
+    def release(cls, db_path):
+        """
+        Give back a handle from acquire(). The connection stays open for the next caller.
+
+        Args:
+            db_path (str or Path): Path of the SQLite database file.
+        """
+        with cls._lock:
+            key = cls._key(db_path)
+            if cls._handles.get(key, 0) > 0:
+                cls._handles[key] -= 1
+
+    @classmethod
+    def close_thread(cls):
+        """Close the calling thread's connections, e.g. when a worker thread finishes."""
+        thread = threading.current_thread()
+        with cls._lock:
+            for key in [key for key in cls._connections if key[1] is thread]:
+                cls._close(key)
+
+    @classmethod
+    def close_all(cls):
+        """Close every pooled connection, e.g. when the app exits."""
+        with cls._lock:
+            for key in list(cls._connections):
+                cls._close(key)
+            cls._handles.clear()
+
+    @classmethod
+    def get_stats(cls):
+        """
+        Report how many connections and handles are open.
+
+        Returns:
+            dict: "connections" and "handles" per database file, and how many
+            connections were "opened", "reused" and "closed" since startup.
+        """
+        with cls._lock:
+            cls._prune()
+            connections = {}
+            for path, _ in cls._connections:
+                connections[path] = connections.get(path, 0) + 1
+            return {
+                "connections": connections,
+                "handles": {path: count for path, count in cls._handles.items() if count},
+                **cls._stats,
+            }
+
+    @classmethod
+    def _prepare(cls, connection, path):
+        # Once per database per process: switch to WAL and apply pending migrations.
+        with cls._setup_lock:
+            if path in cls._prepared:
+                return
+            connection.execute(f"PRAGMA journal_mode = {cls.JOURNAL_MODE}")
+            migrations = MIGRATIONS.get(Path(path).name)
+            if migrations:
+                migrate(connection, migrations)
+            cls._prepared.add(path)
+
+    @classmethod
+    def _prune(cls):
+        # Close connections left behind by threads that have finished. Caller holds the lock.
+        for key in [key for key in cls._connections if not key[1].is_alive()]:
+            cls._close(key)
+
+    @classmethod
+    def _close(cls, key):
+        # Caller holds the lock.
+        connection = cls._connections.pop(key)
+        try:
+            connection.close()
+        except sqlite3.Error as e:
+            print(f"Error closing database connection: {e}")
+        cls._stats["closed"] += 1
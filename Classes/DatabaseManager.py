@@ -1,31 +1,104 @@
 import sqlite3
-from pathlib import Path
 import random, string, hashlib
 from datetime import datetime, timedelta
 import logging
+import threading
 from student import Student
 from tkinter import messagebox
 from admin import Admin
 from SharedData import SharedData
+from ConnectionManager import ConnectionManager
+from DatabaseMigrations import REBUILD_STATS_ROLLUPS
+
+# Queries on hot paths. checkQueryPlans.py checks that each of them is answered from
+# an index (see the migrations in DatabaseMigrations), so keep them in step.
+PASSWORD_BY_EMAIL = {
+    "Student": "SELECT Password FROM Students WHERE Email = ?",
+    "Admin": "SELECT Password FROM Admin WHERE Email = ?",
+}
+ALL_STATS = """
+    SELECT ID, StudentID, AvgReadingSpeed, AvgAccuracy, Date
+    FROM Stats
+    ORDER BY Date DESC
+"""
+# One page of Stats, newest first; the conditions are filled in by fetch_stats_page
+STATS_PAGE = """
+    SELECT ID, StudentID, AvgReadingSpeed, AvgAccuracy, Date
+    FROM Stats
+    WHERE {conditions}
+    ORDER BY Date DESC, ID DESC
+    LIMIT ?
+"""
+# The averages are read from the running totals kept by triggers on Stats (see
+# migration 4 in DatabaseMigrations), so they cost the same however many sessions there are
+AGGREGATED_STATS = """
+    SELECT
+        SpeedSum / SpeedCount as OverallAvgSpeed,
+        AccuracySum / AccuracyCount as OverallAvgAccuracy
+    FROM StatsOverall
+    WHERE ID = 1
+"""
+USER_STATS = """
+    SELECT
+        SUM(SpeedSum) / SUM(SpeedCount) as UserAvgSpeed,
+        SUM(AccuracySum) / SUM(AccuracyCount) as UserAvgAccuracy
+    FROM StatsByStudent
+    WHERE StudentID = ?
+"""
+USER_IMPROVEMENT = """
+    SELECT
+        SpeedSum / SpeedCount as AvgSpeed,
+        AccuracySum / AccuracyCount as AvgAccuracy,
+        Date
+    FROM StatsByStudentDay
+    WHERE StudentID = ? AND Date BETWEEN ? AND ?
+    ORDER BY Date
+"""
+
+def student_id_prefix_range(prefix):
+    # Bounds of the student IDs starting with prefix, ignoring ASCII case, as NOCASE
+    # compares them: everything from the lower-cased prefix up to, but not including,
+    # the prefix with its last character bumped.
+    prefix = prefix.lower()
+    following = chr(ord(prefix[-1]) + 1)
+    if "A" <= following <= "Z":
+        following = "["  # NOCASE sorts capital letters as lower case, after "Z"
+    return prefix, prefix[:-1] + following
 
 class DatabaseManager:
     def __init__(self, db_path: str = None):
         # Define the database path inside the Database folder
         if db_path is None:
-            db_path = Path(__file__).parent.parent / "Database" / "READ_Database.db"
+            db_path = ConnectionManager.READ_DATABASE
         self.db_path = db_path
-        self.connection = sqlite3.connect(db_path)
-        self.cursor = self.connection.cursor()
+        # The connection is pooled per thread, see ConnectionManager; each thread gets its own cursor
+        self._local = threading.local()
+        self._acquired = False
+        self.connect()
+
+    def connect(self):
+        if not self._acquired:
+            ConnectionManager.acquire(self.db_path)
+            self._acquired = True
+
+    @property
+    def connection(self):
+        return ConnectionManager.get_connection(self.db_path)
+
+    @property
+    def cursor(self):
+        connection = self.connection
+        if getattr(self._local, "connection", None) is not connection:
+            self._local.connection = connection
+            self._local.cursor = connection.cursor()
+        return self._local.cursor
 
     #def hash_password(self,password:str)->str:
     #    return hashlib.sha256(password.encode()).hexdigest()       
     
     def check_login_credentials(self, role: str, email: str, password: str):        
         #hashed_password = self.hash_password(password)
-        if role == "Student":
-            query = "SELECT Password FROM Students WHERE Email = ?"
-        else:
-            query = "SELECT Password FROM Admin WHERE Email = ?"
+        query = PASSWORD_BY_EMAIL["Student" if role == "Student" else "Admin"]
         
         self.cursor.execute(query, (email,))
         result = self.cursor.fetchone()
@@ -59,8 +132,10 @@ class DatabaseManager:
 
 
     def close_connection(self):
-        self.cursor.close()
-        self.connection.close()
+        # Give the pooled connection back; it stays open for the other screens.
+        if self._acquired:
+            ConnectionManager.release(self.db_path)
+            self._acquired = False
 
     def view_tables(self):              
         self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
@@ -205,26 +280,68 @@ class DatabaseManager:
             print(f"Error checking user existence: {e}")
             return False
         
+    def add_stats(self, student_id, reading_speed, accuracy):
+        # Record one finished reading session. Safe to call from a worker thread.
+        # The rollup totals are updated by trigger in the same transaction.
+        try:
+            self.cursor.execute(
+                '''INSERT INTO Stats (StudentID, AvgReadingSpeed, AvgAccuracy, Date)
+                VALUES (?, ?, ?, ?)''',
+                (student_id, f"{reading_speed:.1f}", f"{accuracy:.1f}", datetime.now().strftime('%Y-%m-%d'))
+            )
+            self.connection.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error inserting Stats into database: {e}")
+            self.connection.rollback()
+            return False
+
     def fetch_all_stats(self):
         try:
-            self.cursor.execute("""
-                SELECT ID, StudentID, AvgReadingSpeed, AvgAccuracy, Date 
-                FROM Stats 
-                ORDER BY Date DESC
-            """)
+            self.cursor.execute(ALL_STATS)
             return self.cursor.fetchall()
         except sqlite3.Error as e:
             messagebox.showerror("Error", f"Error fetching statistics: {e}")
             return []
     
+    def fetch_stats_page(self, after=None, student_prefix="", start_date=None, end_date=None, page_size=100):
+        # One page of sessions, newest first, for listing Stats without loading all of it.
+        # after is the (Date, ID) of the last row of the previous page, or None for the first
+        # page. Rows without a date come after all the dated ones, and are left out when
+        # filtering by date. Each page is a seek on idx_stats_date_id however deep it is.
+        filters, params = [], []
+        if student_prefix:
+            # Case-insensitive range rather than LIKE, so idx_stats_student_nocase can be used
+            filters.append("StudentID >= ? COLLATE NOCASE AND StudentID < ? COLLATE NOCASE")
+            params += list(student_id_prefix_range(student_prefix))
+        if start_date:
+            filters.append("Date >= ?")
+            params.append(str(start_date))
+        if end_date:
+            filters.append("Date <= ?")
+            params.append(str(end_date))
+
+        def fetch(conditions, condition_params, limit):
+            query = STATS_PAGE.format(conditions=" AND ".join(filters + conditions))
+            self.cursor.execute(query, params + condition_params + [limit])
+            return self.cursor.fetchall()
+
+        try:
+            rows = []
+            if after is None or after[0] is not None:
+                keyset = ["(Date, ID) < (?, ?)"] if after else []
+                rows = fetch(["Date IS NOT NULL"] + keyset, list(after) if after else [], page_size)
+            if len(rows) < page_size and not (start_date or end_date):
+                keyset = ["ID < ?"] if after and after[0] is None else []
+                rows += fetch(["Date IS NULL"] + keyset, [after[1]] if keyset else [], page_size - len(rows))
+            return rows
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Error fetching statistics: {e}")
+            return []
+
     def fetch_aggregated_stats(self):
         try:
-            self.cursor.execute("""
-                SELECT 
-                    AVG(AvgReadingSpeed) as OverallAvgSpeed, 
-                    AVG(AvgAccuracy) as OverallAvgAccuracy
-                FROM Stats
-            """)
+            self.cursor.execute(AGGREGATED_STATS)
             return self.cursor.fetchone()
         except sqlite3.Error as e:
             messagebox.showerror("Error", f"Error fetching aggregated statistics: {e}")
@@ -232,13 +349,7 @@ class DatabaseManager:
 
     def fetch_user_stats(self, student_id):
         try:
-            self.cursor.execute("""
-                SELECT 
-                    AVG(AvgReadingSpeed) as UserAvgSpeed, 
-                    AVG(AvgAccuracy) as UserAvgAccuracy
-                FROM Stats
-                WHERE StudentID = ?
-            """, (student_id,))
+            self.cursor.execute(USER_STATS, (student_id,))
             return self.cursor.fetchone()
         except sqlite3.Error as e:
             messagebox.showerror("Error", f"Error fetching user statistics: {e}")
@@ -246,21 +357,26 @@ class DatabaseManager:
 
     def fetch_user_improvement(self, student_id, start_date, end_date):
         try:
-            self.cursor.execute("""
-                SELECT 
-                    AVG(AvgReadingSpeed) as AvgSpeed, 
-                    AVG(AvgAccuracy) as AvgAccuracy,
-                    Date
-                FROM Stats
-                WHERE StudentID = ? AND Date BETWEEN ? AND ?
-                GROUP BY Date
-                ORDER BY Date
-            """, (student_id, start_date, end_date))
+            self.cursor.execute(USER_IMPROVEMENT, (student_id, start_date, end_date))
             return self.cursor.fetchall()
         except sqlite3.Error as e:
             messagebox.showerror("Error", f"Error fetching user improvement: {e}")
             return []
 
+    def rebuild_stats_rollups(self):
+        # Recompute the running totals from every Stats row, e.g. after editing Stats by hand.
+        try:
+            if not self.connection.in_transaction:
+                self.connection.execute("BEGIN IMMEDIATE")
+            for statement in REBUILD_STATS_ROLLUPS:
+                self.cursor.execute(statement)
+            self.connection.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error rebuilding stats totals: {e}")
+            self.connection.rollback()
+            return False
+
     def add_dummy_data(self, num_students=5, days_range=30):
         try:
             
@@ -296,7 +412,6 @@ class DatabaseManager:
 
     def clear_dummy_data(self):
         try:
-            self.connect_to_database()
             self.cursor.execute("DELETE FROM Stats")
             self.connection.commit()
             print("Successfully cleared all data from Stats table.")
@@ -0,0 +1,266 @@
+import sqlite3
+
+
+def _stats_columns(connection):
+    return [row[1] for row in connection.execute("PRAGMA table_info(Stats)")]
+
+
+def _add_stats_id_and_date(connection):
+    """
+    Give Stats its ID and Date columns.
+
+    Databases made by the original createDatabase.py have neither, while others
+    had them added by hand, so only what is missing is added. Adding an
+    AUTOINCREMENT key means rebuilding the table; existing rows keep their order.
+    """
+    columns = _stats_columns(connection)
+    if "ID" not in columns:
+        date = "Date" if "Date" in columns else "NULL"
+        connection.execute(
+            '''CREATE TABLE Stats_new (
+                ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                StudentID STRING,
+                AvgReadingSpeed REAL,
+                AvgAccuracy REAL,
+                Date TEXT
+            )'''
+        )
+        connection.execute(
+            f'''INSERT INTO Stats_new (StudentID, AvgReadingSpeed, AvgAccuracy, Date)
+            SELECT StudentID, AvgReadingSpeed, AvgAccuracy, {date} FROM Stats ORDER BY rowid'''
+        )
+        connection.execute("DROP TABLE Stats")
+        connection.execute("ALTER TABLE Stats_new RENAME TO Stats")
+    elif "Date" not in columns:
+        connection.execute("ALTER TABLE Stats ADD COLUMN Date TEXT")
+
+
+def _rollup_changes(row, remove=False):
+    """
+    Statements that add a Stats row to the rollup tables, or take it away.
+
+    Args:
+        row (str): "NEW" or "OLD", the trigger's row.
+        remove (bool): Take the row away instead of adding it.
+    """
+    sign = "-" if remove else ""
+    values = (
+        f"{sign}1, {sign}IFNULL({row}.AvgReadingSpeed, 0), {sign}({row}.AvgReadingSpeed IS NOT NULL), "
+        f"{sign}IFNULL({row}.AvgAccuracy, 0), {sign}({row}.AvgAccuracy IS NOT NULL)"
+    )
+    totals = (
+        "Sessions = Sessions + excluded.Sessions, "
+        "SpeedSum = SpeedSum + excluded.SpeedSum, SpeedCount = SpeedCount + excluded.SpeedCount, "
+        "AccuracySum = AccuracySum + excluded.AccuracySum, AccuracyCount = AccuracyCount + excluded.AccuracyCount"
+    )
+    changes = [
+        f"""INSERT INTO StatsOverall (ID, Sessions, SpeedSum, SpeedCount, AccuracySum, AccuracyCount)
+        VALUES (1, {values}) ON CONFLICT (ID) DO UPDATE SET {totals};""",
+        f"""INSERT INTO StatsByStudent (StudentID, Sessions, SpeedSum, SpeedCount, AccuracySum, AccuracyCount)
+        SELECT {row}.StudentID, {values} WHERE {row}.StudentID IS NOT NULL
+        ON CONFLICT (StudentID) DO UPDATE SET {totals};""",
+        f"""INSERT INTO StatsByStudentDay (StudentID, Date, Sessions, SpeedSum, SpeedCount, AccuracySum, AccuracyCount)
+        SELECT {row}.StudentID, {row}.Date, {values} WHERE {row}.StudentID IS NOT NULL AND {row}.Date IS NOT NULL
+        ON CONFLICT (StudentID, Date) DO UPDATE SET {totals};""",
+    ]
+    if remove:
+        # Drop totals that no longer cover any session
+        changes += [
+            f"DELETE FROM StatsByStudent WHERE StudentID = {row}.StudentID AND Sessions <= 0;",
+            f"DELETE FROM StatsByStudentDay WHERE StudentID = {row}.StudentID AND Date = {row}.Date AND Sessions <= 0;",
+        ]
+    return changes
+
+
+def _trigger(name, event, changes):
+    body = "\n".join(changes)
+    return f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON Stats BEGIN\n{body}\nEND"
+
+
+def _rollup_table(name, keys, primary_key, without_rowid=True):
+    return f'''CREATE TABLE IF NOT EXISTS {name} (
+            {keys},
+            Sessions INTEGER NOT NULL DEFAULT 0,
+            SpeedSum REAL NOT NULL DEFAULT 0,
+            SpeedCount INTEGER NOT NULL DEFAULT 0,
+            AccuracySum REAL NOT NULL DEFAULT 0,
+            AccuracyCount INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY ({primary_key})
+        ){" WITHOUT ROWID" if without_rowid else ""}'''
+
+
+# Recompute the rollup tables from Stats, see DatabaseManager.rebuild_stats_rollups
+REBUILD_STATS_ROLLUPS = [
+    "DELETE FROM StatsOverall",
+    "DELETE FROM StatsByStudent",
+    "DELETE FROM StatsByStudentDay",
+    '''INSERT INTO StatsOverall (ID, Sessions, SpeedSum, SpeedCount, AccuracySum, AccuracyCount)
+    SELECT 1, COUNT(*), TOTAL(AvgReadingSpeed), COUNT(AvgReadingSpeed), TOTAL(AvgAccuracy), COUNT(AvgAccuracy)
+    FROM Stats''',
+    '''INSERT INTO StatsByStudent (StudentID, Sessions, SpeedSum, SpeedCount, AccuracySum, AccuracyCount)
+    SELECT StudentID, COUNT(*), TOTAL(AvgReadingSpeed), COUNT(AvgReadingSpeed), TOTAL(AvgAccuracy), COUNT(AvgAccuracy)
+    FROM Stats WHERE StudentID IS NOT NULL GROUP BY StudentID''',
+    '''INSERT INTO StatsByStudentDay (StudentID, Date, Sessions, SpeedSum, SpeedCount, AccuracySum, AccuracyCount)
+    SELECT StudentID, Date, COUNT(*), TOTAL(AvgReadingSpeed), COUNT(AvgReadingSpeed), TOTAL(AvgAccuracy), COUNT(AvgAccuracy)
+    FROM Stats WHERE StudentID IS NOT NULL AND Date IS NOT NULL GROUP BY StudentID, Date''',
+]
+
+
+# Each migration is (version, description, steps); a step is an SQL statement or a
+# function taking the connection. Versions must be consecutive and never change once
+# released: add a new migration instead of editing an old one.
+READ_MIGRATIONS = [
+    (1, "Create the original tables", [
+        '''CREATE TABLE IF NOT EXISTS Students (
+            StudentID STRING PRIMARY KEY,
+            Name TEXT,
+            Email TEXT UNIQUE,
+            Password TEXT,
+            Grade INTEGER,
+            ReadingLevel TEXT
+        )''',
+        '''CREATE TABLE IF NOT EXISTS Admin (
+            AdminID INTEGER PRIMARY KEY AUTOINCREMENT,
+            Name TEXT,
+            Email TEXT UNIQUE,
+            Password TEXT,
+            AdminKey TEXT
+        )''',
+        '''CREATE TABLE IF NOT EXISTS Session (
+            SessionID INTEGER PRIMARY KEY AUTOINCREMENT,
+            StudentID STRING,
+            StoryID INTEGER,
+            ReadingSpeed REAL,
+            Accuracy REAL
+        )''',
+        '''CREATE TABLE IF NOT EXISTS Stats (
+            StudentID STRING,
+            AvgReadingSpeed REAL,
+            AvgAccuracy REAL
+        )''',
+    ]),
+    (2, "Give Stats an ID and Date", [_add_stats_id_and_date]),
+    (3, "Index Stats by student and by date", [
+        # Covering, so per-student averages and improvement never touch the table
+        "CREATE INDEX IF NOT EXISTS idx_stats_student_date ON Stats (StudentID, Date, AvgReadingSpeed, AvgAccuracy)",
+        # Covering, so the newest-first listing is read in index order without a sort
+        "CREATE INDEX IF NOT EXISTS idx_stats_date ON Stats (Date, StudentID, AvgReadingSpeed, AvgAccuracy)",
+    ]),
+    (4, "Keep running totals of Stats overall, per student and per student per day", [
+        _rollup_table("StatsOverall", "ID INTEGER CHECK (ID = 1)", "ID", without_rowid=False),
+        _rollup_table("StatsByStudent", "StudentID STRING", "StudentID"),
+        _rollup_table("StatsByStudentDay", "StudentID STRING, Date TEXT", "StudentID, Date"),
+        # Triggers keep the totals in the same transaction as every change to Stats
+        _trigger("stats_rollup_insert", "INSERT", _rollup_changes("NEW")),
+        _trigger("stats_rollup_delete", "DELETE", _rollup_changes("OLD", remove=True)),
+        _trigger(
+            "stats_rollup_update", "UPDATE OF StudentID, AvgReadingSpeed, AvgAccuracy, Date",
+            _rollup_changes("OLD", remove=True) + _rollup_changes("NEW"),
+        ),
+        *REBUILD_STATS_ROLLUPS,
+    ]),
+    (5, "Index Stats by date and ID for paging newest first", [
+        # An index on Date alone ends in the rowid, so it is ordered by (Date, ID) and
+        # each page of DatabaseManager.fetch_stats_page starts with a seek
+        "DROP INDEX IF EXISTS idx_stats_date",
+        "CREATE INDEX IF NOT EXISTS idx_stats_date_id ON Stats (Date)",
+    ]),
+    (6, "Index Stats by student ID ignoring case for the admin search", [
+        # StudentID has numeric affinity, so LIKE can't use an index; the search is a
+        # NOCASE range instead, see DatabaseManager.fetch_stats_page
+        "CREATE INDEX IF NOT EXISTS idx_stats_student_nocase ON Stats (StudentID COLLATE NOCASE)",
+    ]),
+]
+
+STORY_MIGRATIONS = [
+    (1, "Create the stories table", [
+        '''CREATE TABLE IF NOT EXISTS stories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT,
+            excerpt TEXT,
+            body TEXT,
+            difficulty TEXT
+        )''',
+    ]),
+    (2, "Store precomputed phonemes of each story sentence and word", [
+        '''CREATE TABLE IF NOT EXISTS story_sentences (
+            story_id INTEGER,
+            sentence_index INTEGER,
+            sentence TEXT,
+            phonemes TEXT,
+            version TEXT,
+            PRIMARY KEY (story_id, sentence_index)
+        )''',
+        '''CREATE TABLE IF NOT EXISTS story_words (
+            story_id INTEGER,
+            sentence_index INTEGER,
+            word_index INTEGER,
+            word TEXT,
+            phonemes TEXT,
+            PRIMARY KEY (story_id, sentence_index, word_index)
+        )''',
+    ]),
+    (3, "Index stories by difficulty", [
+        "CREATE INDEX IF NOT EXISTS idx_stories_difficulty ON stories (difficulty)",
+    ]),
+]
+
+# Migrations of each database, by file name
+MIGRATIONS = {
+    "READ_Database.db": READ_MIGRATIONS,
+    "tinystories.db": STORY_MIGRATIONS,
+}
+
+
+def get_schema_version(connection):
+    """Return the last migration applied to a database, 0 if none."""
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(connection, migrations):
+    """
+    Apply the migrations a database has not had yet, in order.
+
+    Each migration runs in its own write transaction together with the update of
+    PRAGMA user_version, so a failed migration leaves the database at the previous
+    version. Safe to run from several processes at once: the version is re-read
+    after taking the write lock.
+
+    Args:
+        connection (sqlite3.Connection): Connection to the database.
+        migrations (list): (version, description, steps) tuples in version order.
+
+    Returns:
+        int: The schema version of the database afterwards.
+
+    Raises:
+        sqlite3.Error: If a migration fails. It is rolled back first.
+    """
+    latest = migrations[-1][0] if migrations else 0
+    version = get_schema_version(connection)
+    if version > latest:
+        print(f"Database schema version {version} is newer than this version of READ ({latest})")
+        return version
+
+    for target, description, steps in migrations:
+        if target <= version:
+            continue
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            version = get_schema_version(connection)
+            if target <= version:
+                connection.rollback()
+                continue
+            for step in steps:
+                if callable(step):
+                    step(connection)
+                else:
+                    connection.execute(step)
+            connection.execute(f"PRAGMA user_version = {target}")
+            connection.commit()
+            version = target
+        except sqlite3.Error as e:
+            connection.rollback()
+            print(f"Error applying database migration {target} ({description}): {e}")
+            raise
+    return version
@@ -4,8 +4,7 @@ from pathlib import Path
 from SharedData import SharedData
 from StoryDatabaseManager import StoryDatabaseManager
 from PIL import Image, ImageTk
-import pyttsx3
-from audio import Audio
+from PhonemizerService import PhonemizerService
 from SharedData import SharedData
 
 class Feedback:
@@ -26,7 +25,7 @@ class Feedback:
     total_correct_words = 0
     total_expected_words = 0
 
-    def __init__(self, transcription, expected_text,reading_session,master=None):
+    def __init__(self, transcription, expected_text,reading_session,master=None, word_scores=None, expected_phonemes=None, word_phonemes=None):
         """
         Initialize the Feedback instance.
 
@@ -35,6 +34,10 @@ class Feedback:
             expected_text (str): The expected text that should have been read.
             reading_session (ReadingSession): The associated reading session.
             master (tk.Tk, optional): The master window. Defaults to None.
+            word_scores (list, optional): Word scores already computed in the background.
+                Computed here if not given.
+            expected_phonemes (str, optional): Precomputed phonemes of the expected text.
+            word_phonemes (list, optional): Precomputed phonemes of each expected word.
         """
         self.master = master if master else tk.Tk()
         self.window = Toplevel()
@@ -43,11 +46,16 @@ class Feedback:
         self.master.geometry("934x575")
         self.master.configure(bg="#FFFFFF")
         self.reading_session = reading_session
-        self.text_speech = pyttsx3.init()
-        self.audio = Audio()
+        self.text_speech = None  # Started on first use, pyttsx3.init() is slow
+        if reading_session is not None:
+            # Share the session's recorder rather than opening another PyAudio instance
+            self.audio = reading_session.recorder
+        else:
+            from audio import Audio
+            self.audio = Audio()
         self.setup_ui()
         self.create_buttons()
-        self.update_content(transcription, expected_text)
+        self.update_content(transcription, expected_text, word_scores, expected_phonemes, word_phonemes)
         self.populate_highlighted_text()
         self.show_feedback()
     
@@ -136,6 +144,9 @@ class Feedback:
     def read_phonemes(self):
         """Read the current word's phonemes using text-to-speech."""
         if self.current_word:
+            if self.text_speech is None:
+                import pyttsx3
+                self.text_speech = pyttsx3.init()
             phonemes = self.current_word
             self.text_speech.say(phonemes)
             self.text_speech.runAndWait()
@@ -180,7 +191,10 @@ class Feedback:
             
             
             if score < 0.6 or self.current_phoneme_index == len(self.word_scores) - 1:
-                current_phonemes = self.audio.expected_phonemes(self.current_word)
+                if self.current_phoneme_index < len(self.word_phonemes):
+                    current_phonemes = self.word_phonemes[self.current_phoneme_index]
+                else:
+                    current_phonemes = self.audio.expected_phonemes(self.current_word)
                 self.phoneme_text.delete(1.0, "end")
                 self.phoneme_text.insert("end", f"{current_phonemes}")
                 
@@ -219,18 +233,32 @@ class Feedback:
         self.highlighted_text.tag_configure("incorrect", foreground="red")
         self.highlighted_text.config(state="disabled")
 
-    def update_content(self, transcription, expected_text):
+    def update_content(self, transcription, expected_text, word_scores=None, expected_phonemes=None, word_phonemes=None):
         """
         Update the feedback content with new transcription and expected text.
 
         Args:
             transcription (str): The transcribed text from the user's reading.
             expected_text (str): The expected text that should have been read.
+            word_scores (list, optional): Word scores already computed in the background.
+                Computed here if not given.
+            expected_phonemes (str, optional): Precomputed phonemes of the expected text.
+                Phonemized here if not given, which runs espeak on the UI thread; the
+                reading session always passes them.
+            word_phonemes (list, optional): Precomputed phonemes of each expected word.
+                The sentence's words are phonemized in one batch if not given.
         """
         self.transcription = transcription
         self.expected_text = expected_text
-        self.expected_phonemes_list = self.audio.expected_phonemes(self.expected_text)
-        self.word_scores = self.audio.improved_compare_phonemes(self.expected_text, self.transcription)
+        if expected_phonemes is None:
+            expected_phonemes = self.audio.expected_phonemes(self.expected_text)
+        self.expected_phonemes_list = expected_phonemes
+        if word_phonemes is None:
+            word_phonemes = PhonemizerService.phonemize_many(self.expected_text.split())
+        self.word_phonemes = word_phonemes
+        if word_scores is None:
+            word_scores, _, _ = self.audio.improved_compare_phonemes(self.expected_text, self.transcription, expected_phonemes)
+        self.word_scores = list(word_scores)
         
         expected_words = self.expected_text.split()
         if len(self.word_scores) < len(expected_words):
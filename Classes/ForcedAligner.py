@@ -0,0 +1,148 @@
+import numpy as np
+
+
+def tokenize_phonemes(phonemes, vocabulary):
+    """
+    Split a phoneme string into the recognizer's tokens, longest match first.
+
+    Args:
+        phonemes (str): Phonemes of one word, without spaces.
+        vocabulary (dict): Token to ID mapping of the recognizer's tokenizer.
+
+    Returns:
+        list: Token IDs. Characters the recognizer has no token for are skipped.
+    """
+    longest = max(len(token) for token in vocabulary)
+    ids = []
+    position = 0
+    while position < len(phonemes):
+        for length in range(min(longest, len(phonemes) - position), 0, -1):
+            token = phonemes[position:position + length]
+            if token in vocabulary:
+                ids.append(vocabulary[token])
+                position += length
+                break
+        else:
+            position += 1
+    return ids
+
+
+class ForcedAligner:
+    """
+    CTC forced alignment of the expected phonemes against the recognizer's output.
+
+    Instead of decoding what the model heard and comparing strings, the expected
+    phoneme tokens are aligned directly to the per-frame log-probabilities of the
+    same forward pass with a Viterbi search over the CTC topology (tokens with
+    optional blanks in between). Every expected phoneme gets the frames it was
+    read in, so each word comes out with its start and end time and a confidence:
+    the mean probability the model gave the expected phonemes on those frames.
+    """
+
+    FRAME_SECONDS = 0.02  # Wav2Vec2 emits one CTC frame per 20 ms of audio
+
+    def __init__(self, vocabulary, blank_id, frame_seconds=FRAME_SECONDS):
+        """
+        Initialize the ForcedAligner.
+
+        Args:
+            vocabulary (dict): Token to ID mapping of the recognizer's tokenizer.
+            blank_id (int): ID of the CTC blank (the tokenizer's pad token).
+            frame_seconds (float): Duration of one emission frame (default: 0.02).
+        """
+        self.vocabulary = vocabulary
+        self.blank_id = blank_id
+        self.frame_seconds = frame_seconds
+
+    def viterbi(self, emissions, tokens):
+        """
+        Find the most likely frame-by-frame path through a token sequence.
+
+        Args:
+            emissions (numpy.ndarray): Log-probabilities of shape (frames, vocabulary).
+            tokens (list): Token IDs to align, in order.
+
+        Returns:
+            numpy.ndarray: For each frame, the index in tokens it was assigned to, or -1 for
+            a blank frame. None if the recording has too few frames for the tokens.
+        """
+        frames = len(emissions)
+        # Repeated tokens need a blank between them, so they need an extra frame
+        repeats = sum(a == b for a, b in zip(tokens, tokens[1:]))
+        if not tokens or frames < len(tokens) + repeats:
+            return None
+
+        # States alternate blank, token, blank, token, ..., blank
+        labels = np.full(2 * len(tokens) + 1, self.blank_id)
+        labels[1::2] = tokens
+        states = len(labels)
+        # A token state can be entered straight from the previous token unless they are the same
+        can_skip = np.zeros(states, dtype=bool)
+        can_skip[3::2] = labels[3::2] != labels[1:-2:2]
+
+        log_probs = emissions[:, labels]
+        scores = np.full(states, -np.inf)
+        scores[:2] = log_probs[0, :2]
+        backpointers = np.zeros((frames, states), dtype=np.int8)
+        unreachable = np.full(2, -np.inf)
+
+        for t in range(1, frames):
+            candidates = np.stack([
+                scores,
+                np.concatenate([unreachable[:1], scores[:-1]]),
+                np.where(can_skip, np.concatenate([unreachable, scores[:-2]]), -np.inf),
+            ])
+            choice = candidates.argmax(axis=0)
+            scores = candidates[choice, np.arange(states)] + log_probs[t]
+            backpointers[t] = choice
+
+        state = states - 1 if scores[-1] >= scores[-2] else states - 2
+        if not np.isfinite(scores[state]):
+            return None
+
+        path = np.empty(frames, dtype=int)
+        for t in range(frames - 1, -1, -1):
+            path[t] = (state - 1) // 2 if state % 2 else -1
+            state -= backpointers[t, state]
+        return path
+
+    def align_words(self, emissions, words, word_phonemes, offset=0.0):
+        """
+        Align a sentence's words to a recording and score them.
+
+        Args:
+            emissions (numpy.ndarray): Log-probabilities of shape (frames, vocabulary).
+            words (list): The expected words.
+            word_phonemes (list): The expected phonemes of each word.
+            offset (float): Time in the recording of the first emission frame, in seconds.
+
+        Returns:
+            list: A dict per word with its "word", "start" and "end" times in seconds,
+            "duration" and "confidence" between 0 and 1. Words that could not be aligned
+            have None times and a confidence of 0.
+        """
+        emissions = np.asarray(emissions, dtype=np.float64)
+        words = list(zip(words, word_phonemes))
+        word_tokens = [tokenize_phonemes(phonemes, self.vocabulary) for _, phonemes in words]
+        tokens = [token for tokens in word_tokens for token in tokens]
+        path = self.viterbi(emissions, tokens)
+
+        alignments = []
+        first_token = 0
+        for (word, _), tokens_of_word in zip(words, word_tokens):
+            token_range = range(first_token, first_token + len(tokens_of_word))
+            first_token += len(tokens_of_word)
+            alignment = {"word": word, "start": None, "end": None, "duration": 0.0, "confidence": 0.0}
+            alignments.append(alignment)
+            if path is None or not tokens_of_word:
+                continue
+
+            word_frames = np.flatnonzero((path >= token_range.start) & (path < token_range.stop))
+            confidences = [
+                np.exp(emissions[path == index, tokens[index]]).mean() for index in token_range
+            ]
+            alignment["start"] = offset + float(word_frames[0]) * self.frame_seconds
+            alignment["end"] = offset + float(word_frames[-1] + 1) * self.frame_seconds
+            alignment["duration"] = alignment["end"] - alignment["start"]
+            alignment["confidence"] = float(np.mean(confidences))
+        return alignments
@@ -0,0 +1,247 @@
+import os
+import time
+import statistics
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+
+class InferenceContext:
+    """
+    Process-wide execution settings for model inference.
+
+    Every forward pass runs with autograd disabled, on intra-op and inter-op thread
+    pools pinned to a budget, and is timed. The default budget splits the machine's
+    cores between READ_SEATS sessions (1 if unset) and keeps one core free for the
+    UI and recording threads, so several seats on one lab PC don't thrash.
+    """
+
+    _threads_configured = False
+    _lock = threading.Lock()
+    _timings = deque(maxlen=200)
+
+    @staticmethod
+    def default_thread_budget():
+        """
+        Get the number of intra-op threads one session should use.
+
+        Returns:
+            int: Cores per seat minus one for the UI, at least 1.
+        """
+        seats = max(1, int(os.environ.get("READ_SEATS", "1")))
+        return max(1, (os.cpu_count() or 1) // seats - 1)
+
+    @classmethod
+    def configure_threads(cls, num_threads=None, interop_threads=None):
+        """
+        Pin PyTorch's thread pools. Only the first call in a process has an effect.
+
+        Args:
+            num_threads (int, optional): Intra-op threads. Defaults to READ_INFERENCE_THREADS,
+                then to default_thread_budget().
+            interop_threads (int, optional): Inter-op threads. Defaults to
+                READ_INFERENCE_INTEROP_THREADS, then to 1.
+        """
+        import torch
+
+        with cls._lock:
+            if cls._threads_configured:
+                return
+            cls._threads_configured = True
+            num_threads = num_threads or int(os.environ.get("READ_INFERENCE_THREADS", 0)) or cls.default_thread_budget()
+            interop_threads = interop_threads or int(os.environ.get("READ_INFERENCE_INTEROP_THREADS", 0)) or 1
+            torch.set_num_threads(num_threads)
+            try:
+                torch.set_num_interop_threads(interop_threads)
+            except RuntimeError as e:
+                # PyTorch refuses once inter-op work has already started in this process
+                print(f"Could not set inter-op threads: {e}")
+
+    @classmethod
+    @contextmanager
+    def run(cls, label="inference", inference_mode=True):
+        """
+        Run a block of model code without autograd and record how long it took.
+
+        Args:
+            label (str): Name recorded with the timing, e.g. "warm-up" or "stream".
+            inference_mode (bool): Use torch.inference_mode rather than torch.no_grad.
+        """
+        import torch
+
+        cls.configure_threads()
+        grad_context = torch.inference_mode() if inference_mode else torch.no_grad()
+        start = time.perf_counter()
+        try:
+            with grad_context:
+                yield
+        finally:
+            cls._timings.append((label, time.perf_counter() - start))
+
+    @classmethod
+    def get_timings(cls, label=None):
+        """
+        Get the durations of recent inference calls.
+
+        Args:
+            label (str, optional): Only return calls with this label.
+
+        Returns:
+            list: (label, seconds) pairs, oldest first.
+        """
+        return [timing for timing in list(cls._timings) if label is None or timing[0] == label]
+
+    @classmethod
+    def get_summary(cls, label=None):
+        """
+        Summarise recent inference call durations.
+
+        Args:
+            label (str, optional): Only include calls with this label.
+
+        Returns:
+            dict: calls, mean, median and max in seconds, or None if there are no calls.
+        """
+        durations = [seconds for _, seconds in cls.get_timings(label)]
+        if not durations:
+            return None
+        return {
+            "calls": len(durations),
+            "mean": statistics.mean(durations),
+            "median": statistics.median(durations),
+            "max": max(durations),
+        }
+
+
+class InferenceBackend:
+    """
+    Full-precision CPU inference for the phoneme recognizer.
+
+    A backend prepares the loaded model once (for example by quantizing it) and
+    then runs every forward pass. Subclasses override prepare() to change how the
+    model is executed; all of them share the same options.
+    """
+
+    name = "fp32"
+
+    def __init__(self, inference_mode=True, num_threads=None, interop_threads=None):
+        """
+        Initialize the backend.
+
+        Args:
+            inference_mode (bool): Run under torch.inference_mode instead of
+                torch.no_grad (default: True).
+            num_threads (int, optional): Intra-op thread count for PyTorch. Uses the
+                InferenceContext budget when None.
+            interop_threads (int, optional): Inter-op thread count for PyTorch. Uses the
+                InferenceContext budget when None.
+        """
+        self.inference_mode = inference_mode
+        self.num_threads = num_threads
+        self.interop_threads = interop_threads
+
+    def prepare(self, model):
+        """
+        Get the model ready for inference with this backend.
+
+        Args:
+            model (Wav2Vec2ForCTC): The freshly loaded fp32 model.
+
+        Returns:
+            torch.nn.Module: The model to run.
+        """
+        InferenceContext.configure_threads(self.num_threads, self.interop_threads)
+        model.eval()
+        return model
+
+    def run(self, model, input_values, label="inference", **kwargs):
+        """
+        Run a timed forward pass inside the InferenceContext.
+
+        Args:
+            model (torch.nn.Module): The model returned by prepare().
+            input_values (torch.Tensor): Processor output of shape (batch, samples).
+            label (str): Name recorded with the call's timing.
+            **kwargs: Extra model arguments such as attention_mask.
+
+        Returns:
+            torch.Tensor: The CTC logits.
+        """
+        with InferenceContext.run(label, self.inference_mode):
+            return model(input_values, **kwargs).logits
+
+    def describe(self):
+        """Return a short description of the backend and its options."""
+        import torch
+
+        mode = "inference_mode" if self.inference_mode else "no_grad"
+        return f"{self.name} ({mode}, {torch.get_num_threads()}+{torch.get_num_interop_threads()} threads)"
+
+
+class Int8DynamicBackend(InferenceBackend):
+    """
+    CPU inference with the model's linear layers dynamically quantized to int8.
+
+    Weights are stored as int8 and activations are quantized on the fly, which
+    shrinks the transformer layers to about a quarter of their size and speeds up
+    the matrix multiplications that dominate Wav2Vec2 inference on CPU.
+    """
+
+    name = "int8"
+
+    def prepare(self, model):
+        """Quantize the model's nn.Linear layers to int8."""
+        import torch
+
+        model = super().prepare(model)
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+BACKENDS = {
+    InferenceBackend.name: InferenceBackend,
+    Int8DynamicBackend.name: Int8DynamicBackend,
+}
+
+
+def create_backend(name=None, **options):
+    """
+    Create an inference backend from arguments or the environment.
+
+    Unset arguments are read from READ_INFERENCE_BACKEND ("fp32" or "int8") and
+    READ_INFERENCE_MODE ("0" to use torch.no_grad). Thread counts default to the
+    InferenceContext budget.
+
+    Args:
+        name (str, optional): Backend name.
+        **options: Backend options, see InferenceBackend.
+
+    Returns:
+        InferenceBackend: The configured backend.
+    """
+    name = name or os.environ.get("READ_INFERENCE_BACKEND", InferenceBackend.name)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{name}', expected one of {', '.join(BACKENDS)}")
+    if "inference_mode" not in options and os.environ.get("READ_INFERENCE_MODE"):
+        options["inference_mode"] = os.environ["READ_INFERENCE_MODE"] != "0"
+    return BACKENDS[name](**options)
+
+
+def model_memory(model):
+    """
+    Get the number of bytes held by a model's weights, including quantized ones.
+
+    Args:
+        model (torch.nn.Module): The model to measure.
+
+    Returns:
+        int: Total size of the tensors in the model's state dict.
+    """
+    import torch
+
+    total = 0
+    for value in model.state_dict().values():
+        tensors = value if isinstance(value, tuple) else (value,)
+        for tensor in tensors:
+            if isinstance(tensor, torch.Tensor):
+                total += tensor.numel() * tensor.element_size()
+    return total
@@ -1,9 +1,12 @@
+import os
 import tkinter as tk
 from tkinter import messagebox, StringVar
 from pathlib import Path
 from PIL import Image, ImageTk
 from DatabaseManager import DatabaseManager
+from ConnectionManager import ConnectionManager
 from SharedData import SharedData
+from ModelRegistry import ModelRegistry
 
 class Login:
     """
@@ -43,6 +46,8 @@ class Login:
 
         self.load_assets()
         self.create_ui()
+        # Import the speech libraries once the window is up rather than before it
+        self.master.after(200, ModelRegistry.start_preload)
 
     def load_assets(self):
         """Load image assets for the interface."""
@@ -170,6 +175,7 @@ class Login:
             if role == "Student":
                 student = db_manager.get_user(role, email, password)
                 SharedData.set_student(student)
+                ModelRegistry.start_warm_up()  # Load the speech model while the student picks a story
                 self.open_select_story()
             else:
                 admin = db_manager.get_user(role, email, password)
@@ -238,7 +244,13 @@ def main():
     """
     root = tk.Tk()
     app = Login(root)
+    if os.environ.get("READ_STARTUP_PROBE"):
+        # Used by checkStartup.py: draw the window once and exit
+        root.update()
+        root.destroy()
+        return
     root.mainloop()
+    ConnectionManager.close_all()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,249 @@
+import os
+import time
+import importlib
+import threading
+import numpy as np
+from InferenceBackend import InferenceContext, create_backend, model_memory
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class ModelRegistry:
+    """
+    Process-wide registry for the Wav2Vec2 phoneme recognition model.
+
+    The model and processor are loaded lazily the first time any consumer asks for
+    them and are then shared by every Audio instance and the speechTest module, so
+    opening a reading session or a feedback window never reloads the weights.
+    """
+
+    MODEL_NAME = "facebook/wav2vec2-xlsr-53-espeak-cv-ft"
+    PRELOAD_MODULES = ("transformers", "phonemizer.backend", "audio")
+
+    _model = None
+    _processor = None
+    _backend = None
+    _lock = threading.Lock()
+    # Guards only starting the background threads. Never held while loading, so the
+    # UI thread can call start_preload() and start_warm_up() without waiting on _lock
+    _thread_lock = threading.Lock()
+    _warm_up_thread = None
+    _preload_thread = None
+    _status = "idle"
+    _progress = 0.0
+    _error = None
+    _metrics = {
+        "backend": None,
+        "load_time": None,
+        "model_memory": None,
+        "rss_before": None,
+        "rss_after": None,
+    }
+
+    @classmethod
+    def configure(cls, backend=None, **options):
+        """
+        Choose the inference backend. Must be called before the model is loaded.
+
+        Args:
+            backend (str, optional): "fp32" or "int8". Defaults to READ_INFERENCE_BACKEND.
+            **options: Backend options, see InferenceBackend.
+        """
+        with cls._lock:
+            if cls._model is not None:
+                raise RuntimeError("The speech model is already loaded; configure the backend before using it")
+            cls._backend = create_backend(backend, **options)
+
+    @classmethod
+    def get_backend(cls):
+        """Return the configured inference backend, creating the default one if needed."""
+        if cls._backend is None:
+            cls._backend = create_backend()
+        return cls._backend
+
+    @classmethod
+    def load(cls):
+        """
+        Load the model and processor if they have not been loaded yet.
+
+        Safe to call from several threads at once; only the first caller pays for
+        the load and the others wait for it to finish.
+        """
+        if cls._model is not None:
+            return
+        with cls._lock:
+            if cls._model is not None:
+                return
+            rss_before = cls.get_resident_memory()
+            start = time.perf_counter()
+
+            cls._set_status("loading", 0.1)
+            # transformers (and torch with it) takes seconds to import, so it is only
+            # imported here, when the model is actually needed
+            import transformers
+            from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
+            transformers.logging.set_verbosity_error()
+            processor = Wav2Vec2Processor.from_pretrained(cls.MODEL_NAME)
+            cls._set_status("loading", 0.3)
+            model = Wav2Vec2ForCTC.from_pretrained(cls.MODEL_NAME)
+            backend = cls.get_backend()
+            model = backend.prepare(model)
+
+            cls._metrics["backend"] = backend.describe()
+            cls._metrics["load_time"] = time.perf_counter() - start
+            cls._metrics["model_memory"] = model_memory(model)
+            cls._metrics["rss_before"] = rss_before
+            cls._metrics["rss_after"] = cls.get_resident_memory()
+            cls._processor = processor
+            cls._model = model
+            cls._set_status("loaded", 0.8)
+            print(f"Loaded {cls.MODEL_NAME} ({cls._metrics['backend']}) in {cls._metrics['load_time']:.2f}s")
+
+    @classmethod
+    def start_preload(cls):
+        """
+        Import the speech libraries in a worker thread.
+
+        Screens only import them when they need them, so the first window opens
+        quickly; this gets the imports out of the way before a reading session
+        needs them. It does not load the model weights, see start_warm_up().
+        """
+        with cls._thread_lock:
+            if cls._preload_thread is not None:
+                return
+            cls._preload_thread = threading.Thread(target=cls._preload, daemon=True)
+            cls._preload_thread.start()
+
+    @classmethod
+    def _preload(cls):
+        """Import each of PRELOAD_MODULES and look up the phonemizer's version stamp."""
+        for name in cls.PRELOAD_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                print(f"Error preloading {name}: {e}")
+        try:
+            from PhonemizerService import PhonemizerService
+            PhonemizerService.version()
+        except Exception as e:
+            print(f"Error preloading the phonemizer version: {e}")
+
+    @classmethod
+    def start_warm_up(cls):
+        """
+        Start loading the model and running a dummy inference in a worker thread.
+
+        Returns immediately. Calling it again while a warm-up is running, or after
+        the model is ready, does nothing. Poll get_status() to follow progress.
+        """
+        with cls._thread_lock:
+            if cls._status == "ready":
+                return
+            if cls._warm_up_thread is not None and cls._warm_up_thread.is_alive():
+                return
+            cls._error = None
+            cls._warm_up_thread = threading.Thread(target=cls._warm_up, daemon=True)
+            cls._warm_up_thread.start()
+
+    @classmethod
+    def _warm_up(cls):
+        """Load the model and run one inference on silence to build the first graph."""
+        try:
+            cls.load()
+            cls._set_status("warming", 0.9)
+            silence = np.zeros(16000, dtype=np.float32)
+            input_values = cls._processor(silence, return_tensors="pt", sampling_rate=16000).input_values
+            cls.infer(input_values, label="warm-up")
+            cls._set_status("ready", 1.0)
+        except Exception as e:
+            cls._error = e
+            cls._set_status("failed", 0.0)
+            print(f"Error warming up speech model: {e}")
+
+    @classmethod
+    def _set_status(cls, status, progress):
+        cls._status = status
+        cls._progress = progress
+
+    @classmethod
+    def get_status(cls):
+        """
+        Get the readiness of the shared model.
+
+        Returns:
+            tuple: (status, progress) where status is one of "idle", "loading",
+            "loaded", "warming", "ready" or "failed" and progress is between 0 and 1.
+        """
+        return cls._status, cls._progress
+
+    @classmethod
+    def is_ready(cls):
+        """Return True once the model is loaded and has run its first inference."""
+        return cls._status == "ready"
+
+    @classmethod
+    def get_error(cls):
+        """Return the exception raised by the last failed warm-up, if any."""
+        return cls._error
+
+    @classmethod
+    def get_model(cls):
+        """Return the shared Wav2Vec2ForCTC model, loading it on first use."""
+        cls.load()
+        return cls._model
+
+    @classmethod
+    def get_processor(cls):
+        """Return the shared Wav2Vec2Processor, loading it on first use."""
+        cls.load()
+        return cls._processor
+
+    @classmethod
+    def infer(cls, input_values, label="inference", **kwargs):
+        """
+        Run the shared model through the configured backend.
+
+        Args:
+            input_values (torch.Tensor): Processor output of shape (batch, samples).
+            label (str): Name recorded with the call's timing, see InferenceContext.
+            **kwargs: Extra model arguments such as attention_mask.
+
+        Returns:
+            torch.Tensor: The CTC logits.
+        """
+        return cls.get_backend().run(cls.get_model(), input_values, label=label, **kwargs)
+
+    @classmethod
+    def is_loaded(cls):
+        """Return True if the model and processor are already in memory."""
+        return cls._model is not None
+
+    @classmethod
+    def get_metrics(cls):
+        """
+        Get load-time and memory metrics for the shared model.
+
+        Returns:
+            dict: backend (description), load_time (seconds), model_memory (bytes held by the weights),
+            rss_before/rss_after (process resident memory in bytes around the load,
+            None when psutil is not installed) and inference (timing summary of recent
+            model calls, see InferenceContext.get_summary).
+        """
+        metrics = dict(cls._metrics)
+        metrics["inference"] = InferenceContext.get_summary()
+        return metrics
+
+    @staticmethod
+    def get_resident_memory():
+        """
+        Get the resident memory of the current process.
+
+        Returns:
+            int: Resident set size in bytes, or None if psutil is not available.
+        """
+        if psutil is None:
+            return None
+        return psutil.Process(os.getpid()).memory_info().rss
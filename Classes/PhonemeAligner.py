@@ -0,0 +1,321 @@
+from typing import List, Optional, Tuple
+import numpy as np
+
+# How alike two phonemes sound, from 0 (unrelated) to 1 (identical). Pairs are
+# looked up in either order.
+PHONEME_SIMILARITY = {
+    ('a', 'ɐ'): 0.9, ('i', 'ɪ'): 0.9, ('u', 'ʊ'): 0.9,
+    ('e', 'ɛ'): 0.9, ('o', 'ɔ'): 0.9, ('ə', 'ʌ'): 0.9,
+    ('d', 't'): 0.8, ('b', 'p'): 0.8, ('g', 'k'): 0.8,
+    ('m', 'n'): 0.8, ('f', 'v'): 0.8, ('s', 'z'): 0.8,
+    ('r', 'l'): 0.7, ('ʃ', 's'): 0.7, ('θ', 'f'): 0.7,
+}
+
+
+def phoneme_similarity(a: str, b: str) -> float:
+    """
+    Get how alike two phonemes are.
+
+    Args:
+        a (str): A phoneme.
+        b (str): Another phoneme.
+
+    Returns:
+        float: 1 for identical phonemes, the PHONEME_SIMILARITY value for similar ones, else 0.
+    """
+    if a == b:
+        return 1.0
+    return PHONEME_SIMILARITY.get((a, b), PHONEME_SIMILARITY.get((b, a), 0.0))
+
+
+class PhonemeAligner:
+    """
+    Weighted edit-distance (Needleman-Wunsch) aligner for phoneme strings.
+
+    A whole sentence's expected phonemes are aligned against the recorded ones in
+    a single dynamic programming pass. Substituting a phoneme costs one minus its
+    similarity to the one heard, so 'd' read as 't' is cheaper than 'd' read as
+    'm', and skipping or adding a phoneme costs gap_cost. Each word's span of the
+    recording and its score are then read off the alignment in one linear pass.
+
+    Phonemes are mapped to integer IDs and the similarities kept in a dense NumPy
+    matrix built once, so the table is filled a whole row at a time and the word
+    scores are summed with array operations.
+    """
+
+    # Costs are counted in whole thousandths so equal-cost paths compare exactly
+    cost_scale = 1000
+
+    def __init__(self, gap_cost: float = 1.0):
+        """
+        Initialize the PhonemeAligner.
+
+        Args:
+            gap_cost (float): Cost of a phoneme that was skipped or added (default: 1.0).
+        """
+        self.gap_cost = gap_cost
+        self.gap = round(gap_cost * self.cost_scale)
+
+        # ID 0 is every phoneme missing from PHONEME_SIMILARITY
+        alphabet = sorted({phoneme for pair in PHONEME_SIMILARITY for phoneme in pair})
+        self.alphabet_codes = np.array([ord(phoneme) for phoneme in alphabet], dtype=np.uint32)
+        self.similarity_matrix = np.zeros((len(alphabet) + 1, len(alphabet) + 1))
+        for (a, b), similarity in PHONEME_SIMILARITY.items():
+            a_id, b_id = alphabet.index(a) + 1, alphabet.index(b) + 1
+            self.similarity_matrix[a_id, b_id] = self.similarity_matrix[b_id, a_id] = similarity
+
+    def encode(self, phonemes: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert a phoneme string to arrays.
+
+        Args:
+            phonemes (str): Phonemes, one character per phoneme.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The code point of each phoneme and its row in similarity_matrix.
+        """
+        codes = np.frombuffer(phonemes.encode("utf-32-le"), dtype=np.uint32)
+        positions = np.searchsorted(self.alphabet_codes, codes)
+        known = self.alphabet_codes[np.minimum(positions, len(self.alphabet_codes) - 1)] == codes
+        return codes, np.where(known, positions + 1, 0)
+
+    def similarity(self, expected: str, recorded: str) -> np.ndarray:
+        """
+        Get the similarity of every expected phoneme to every recorded one.
+
+        Args:
+            expected (str): Expected phonemes, one character per phoneme.
+            recorded (str): Recorded phonemes, one character per phoneme.
+
+        Returns:
+            np.ndarray: Matrix of shape (len(expected), len(recorded)) with values between 0 and 1.
+        """
+        expected_codes, expected_ids = self.encode(expected)
+        recorded_codes, recorded_ids = self.encode(recorded)
+        return np.where(
+            expected_codes[:, None] == recorded_codes[None, :],
+            1.0,
+            self.similarity_matrix[expected_ids[:, None], recorded_ids[None, :]],
+        )
+
+    def substitution_costs(self, similarity: np.ndarray) -> np.ndarray:
+        """Cost, in thousandths, of aligning phonemes with the given similarities."""
+        return np.rint((1.0 - similarity) * self.cost_scale).astype(np.int64)
+
+    def distance_matrix(self, expected: str, recorded: str, similarity: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Fill the edit-distance table between two phoneme strings.
+
+        Args:
+            expected (str): Expected phonemes, one character per phoneme.
+            recorded (str): Recorded phonemes, one character per phoneme.
+            similarity (np.ndarray, optional): Output of similarity(), computed if not given.
+
+        Returns:
+            np.ndarray: Cost, in thousandths, of aligning each prefix of expected with each prefix of recorded.
+        """
+        if similarity is None:
+            similarity = self.similarity(expected, recorded)
+        costs = self.substitution_costs(similarity)
+        gap = self.gap
+        steps = np.arange(len(recorded) + 1) * gap
+
+        table = np.empty((len(expected) + 1, len(recorded) + 1), dtype=np.int64)
+        table[0] = steps
+        for i in range(1, len(expected) + 1):
+            previous = table[i - 1]
+            row = np.empty(len(recorded) + 1, dtype=np.int64)
+            row[0] = i * gap
+            np.minimum(previous[:-1] + costs[i - 1], previous[1:] + gap, out=row[1:])
+            # A run of added phonemes: row[j] = min over k <= j of row[k] + (j - k) * gap
+            table[i] = np.minimum.accumulate(row - steps) + steps
+        return table
+
+    def _align(self, expected: str, recorded: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Align two phoneme strings, returning the path as index arrays (-1 for a gap) and the similarities."""
+        similarity = self.similarity(expected, recorded)
+        table = self.distance_matrix(expected, recorded, similarity).tolist()
+        costs = self.substitution_costs(similarity).tolist()
+        gap = self.gap
+
+        path_expected, path_recorded = [], []
+        i, j = len(expected), len(recorded)
+        # Walk back from the end, preferring substitutions, then skips, then additions
+        while i > 0 or j > 0:
+            if i > 0 and j > 0 and table[i][j] == table[i - 1][j - 1] + costs[i - 1][j - 1]:
+                i, j = i - 1, j - 1
+                path_expected.append(i)
+                path_recorded.append(j)
+            elif i > 0 and table[i][j] == table[i - 1][j] + gap:
+                i -= 1
+                path_expected.append(i)
+                path_recorded.append(-1)
+            else:
+                j -= 1
+                path_expected.append(-1)
+                path_recorded.append(j)
+        return np.array(path_expected[::-1], dtype=int), np.array(path_recorded[::-1], dtype=int), similarity
+
+    def align(self, expected: str, recorded: str) -> List[Tuple[Optional[int], Optional[int]]]:
+        """
+        Find the cheapest alignment of two phoneme strings.
+
+        Args:
+            expected (str): Expected phonemes, one character per phoneme.
+            recorded (str): Recorded phonemes, one character per phoneme.
+
+        Returns:
+            List[Tuple[Optional[int], Optional[int]]]: (expected index, recorded index) pairs in
+            order. A None index marks a phoneme that was skipped (recorded None) or added
+            (expected None).
+        """
+        path_expected, path_recorded, _ = self._align(expected, recorded)
+        return [
+            (None if i < 0 else i, None if j < 0 else j)
+            for i, j in zip(path_expected.tolist(), path_recorded.tolist())
+        ]
+
+    def word_scores(self, words: List[str], word_phonemes: List[str], recorded: str) -> List[Tuple[str, float]]:
+        """
+        Score each word of a sentence from one alignment of the whole sentence.
+
+        Args:
+            words (List[str]): The expected words.
+            word_phonemes (List[str]): The expected phonemes of each word.
+            recorded (str): The recorded phonemes, without spaces.
+
+        Returns:
+            List[Tuple[str, float]]: Each word with the similarity of its phonemes to the span
+            of the recording aligned with them, between 0 and 1.
+        """
+        words = list(zip(words, word_phonemes))
+        if not words:
+            return []
+        lengths = np.array([len(phonemes) for _, phonemes in words])
+        expected = "".join(phonemes for _, phonemes in words)
+        path_expected, path_recorded, similarity = self._align(expected, recorded)
+
+        # Word of each step: the word of the last expected phoneme reached, so added
+        # phonemes belong to the word being read when they were heard
+        owner = np.repeat(np.arange(len(words)), lengths)
+        reached = path_expected >= 0
+        last = np.maximum.accumulate(np.where(reached, np.arange(len(path_expected)), 0))
+        step_word = np.where(np.maximum.accumulate(reached), owner[path_expected[last]] if len(owner) else 0, 0)
+
+        heard = path_recorded >= 0
+        matched_steps = heard & reached
+        span_lengths = np.bincount(step_word[heard], minlength=len(words))
+        matched = np.bincount(
+            step_word[matched_steps],
+            weights=similarity[path_expected[matched_steps], path_recorded[matched_steps]],
+            minlength=len(words),
+        )
+        scores = matched / np.maximum(np.maximum(lengths, span_lengths), 1)
+        return [(text, float(score)) for (text, _), score in zip(words, scores)]
+
+
+class ReferencePhonemeAligner(PhonemeAligner):
+    """
+    Pure-Python PhonemeAligner, one table cell at a time.
+
+    Kept as the reference the vectorized aligner is checked against in
+    benchmarkAlignment.py.
+    """
+
+    def substitution_cost(self, a: str, b: str) -> int:
+        """Cost, in thousandths, of aligning expected phoneme a with recorded phoneme b."""
+        return round((1.0 - phoneme_similarity(a, b)) * self.cost_scale)
+
+    def distance_matrix(self, expected: str, recorded: str) -> List[List[int]]:
+        """
+        Fill the edit-distance table between two phoneme strings.
+
+        Args:
+            expected (str): Expected phonemes, one character per phoneme.
+            recorded (str): Recorded phonemes, one character per phoneme.
+
+        Returns:
+            List[List[int]]: Cost, in thousandths, of aligning each prefix of expected with each prefix of recorded.
+        """
+        gap = self.gap
+        previous = [j * gap for j in range(len(recorded) + 1)]
+        table = [previous]
+        for i, a in enumerate(expected, 1):
+            current = [i * gap]
+            for j, b in enumerate(recorded, 1):
+                current.append(min(
+                    previous[j - 1] + self.substitution_cost(a, b),
+                    previous[j] + gap,
+                    current[j - 1] + gap,
+                ))
+            table.append(current)
+            previous = current
+        return table
+
+    def align(self, expected: str, recorded: str) -> List[Tuple[Optional[int], Optional[int]]]:
+        """
+        Find the cheapest alignment of two phoneme strings.
+
+        Args:
+            expected (str): Expected phonemes, one character per phoneme.
+            recorded (str): Recorded phonemes, one character per phoneme.
+
+        Returns:
+            List[Tuple[Optional[int], Optional[int]]]: (expected index, recorded index) pairs in
+            order. A None index marks a phoneme that was skipped (recorded None) or added
+            (expected None).
+        """
+        table = self.distance_matrix(expected, recorded)
+        gap = self.gap
+        path = []
+        i, j = len(expected), len(recorded)
+        # Walk back from the end, preferring substitutions, then skips, then additions
+        while i > 0 or j > 0:
+            if i > 0 and j > 0 and table[i][j] == table[i - 1][j - 1] + self.substitution_cost(expected[i - 1], recorded[j - 1]):
+                i, j = i - 1, j - 1
+                path.append((i, j))
+            elif i > 0 and table[i][j] == table[i - 1][j] + gap:
+                i -= 1
+                path.append((i, None))
+            else:
+                j -= 1
+                path.append((None, j))
+        path.reverse()
+        return path
+
+    def word_scores(self, words: List[str], word_phonemes: List[str], recorded: str) -> List[Tuple[str, float]]:
+        """
+        Score each word of a sentence from one alignment of the whole sentence.
+
+        Args:
+            words (List[str]): The expected words.
+            word_phonemes (List[str]): The expected phonemes of each word.
+            recorded (str): The recorded phonemes, without spaces.
+
+        Returns:
+            List[Tuple[str, float]]: Each word with the similarity of its phonemes to the span
+            of the recording aligned with them, between 0 and 1.
+        """
+        words = list(zip(words, word_phonemes))
+        expected = "".join(phonemes for _, phonemes in words)
+
+        # Which word each expected phoneme belongs to
+        owner = [index for index, (_, phonemes) in enumerate(words) for _ in phonemes]
+        matched = [0.0] * len(words)
+        span_lengths = [0] * len(words)
+
+        word = 0
+        for i, j in self.align(expected, recorded):
+            if i is not None:
+                word = owner[i]
+            if j is None or not words:
+                continue
+            # Added phonemes belong to the word being read when they were heard
+            span_lengths[word] += 1
+            if i is not None:
+                matched[word] += phoneme_similarity(expected[i], recorded[j])
+
+        return [
+            (text, matched[index] / max(len(phonemes), span_lengths[index], 1))
+            for index, (text, phonemes) in enumerate(words)
+        ]
@@ -0,0 +1,241 @@
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from ConnectionManager import ConnectionManager
+
+
+class PhonemizerService:
+    """
+    Memoized, batched front end for espeak phonemization.
+
+    Results are kept in an in-process LRU cache and in an on-disk SQLite cache,
+    both keyed on the text, the language and the phonemizer options, so common
+    words and story sentences only ever go through espeak once. Cache misses are
+    phonemized by a long-lived backend per language and options, so espeak is
+    initialised once per process instead of once per call, and a list of texts
+    goes through it in a single batch.
+    """
+
+    DEFAULT_OPTIONS = {
+        "backend": "espeak",
+        "strip": True,
+        "preserve_punctuation": False,
+        "with_stress": False,
+    }
+    cache_size = 4096
+    db_path = Path(__file__).parent.parent / "Database" / "phoneme_cache.db"
+
+    _memory = OrderedDict()
+    _lock = threading.Lock()
+    _local = threading.local()
+    _stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "batches": 0}
+    _backends = {}
+    _versions = {}
+
+    @classmethod
+    def phonemize(cls, text, language="en-us", **options):
+        """
+        Phonemize text, using the caches when possible.
+
+        Args:
+            text (str): The text to phonemize.
+            language (str): espeak language code (default: "en-us").
+            **options: Overrides for DEFAULT_OPTIONS.
+
+        Returns:
+            str: The phonemes, with words separated by spaces.
+        """
+        return cls.phonemize_many([text], language, **options)[0]
+
+    @classmethod
+    def phonemize_many(cls, texts, language="en-us", cache=True, **options):
+        """
+        Phonemize a list of sentences or words, sending every cache miss to espeak in one batch.
+
+        Args:
+            texts (list): The texts to phonemize.
+            language (str): espeak language code (default: "en-us").
+            cache (bool): Read and write the caches. Turn off to time espeak itself.
+            **options: Overrides for DEFAULT_OPTIONS.
+
+        Returns:
+            list: The phonemes of each text, in the same order.
+        """
+        options = {**cls.DEFAULT_OPTIONS, **options}
+        options_key = cls._options_key(language, options)
+        results = {}
+
+        if cache:
+            with cls._lock:
+                for text in texts:
+                    key = (text, options_key)
+                    if key in cls._memory:
+                        cls._memory.move_to_end(key)
+                        cls._stats["memory_hits"] += 1
+                        results[text] = cls._memory[key]
+            for text, phonemes in cls._load_many(
+                [text for text in dict.fromkeys(texts) if text not in results], options_key
+            ).items():
+                cls._stats["disk_hits"] += 1
+                results[text] = phonemes
+
+        misses = [text for text in dict.fromkeys(texts) if text not in results]
+        if misses:
+            cls._stats["misses"] += len(misses)
+            cls._stats["batches"] += 1
+            phonemized = cls._run_backend(misses, language, options)
+            results.update(zip(misses, phonemized))
+            if cache:
+                cls._store_many([((text, options_key), results[text]) for text in misses])
+
+        if cache:
+            for text in dict.fromkeys(texts):
+                cls._remember((text, options_key), results[text])
+        return [results[text] for text in texts]
+
+    @classmethod
+    def _get_backend(cls, language, options):
+        """
+        Get the long-lived backend for a language and options, creating it on first use.
+
+        Returns:
+            tuple: The phonemizer backend and the lock serialising calls into it.
+        """
+        # phonemizer is only imported once something actually needs espeak
+        from phonemizer.backend import BACKENDS
+
+        key = cls._options_key(language, options)
+        with cls._lock:
+            if key not in cls._backends:
+                backend_class = BACKENDS[options["backend"]]
+                backend = backend_class(
+                    language,
+                    preserve_punctuation=options["preserve_punctuation"],
+                    with_stress=options["with_stress"],
+                )
+                cls._backends[key] = (backend, threading.Lock())
+            return cls._backends[key]
+
+    @classmethod
+    def _run_backend(cls, texts, language, options):
+        """Phonemize a batch of texts with the persistent backend."""
+        backend, backend_lock = cls._get_backend(language, options)
+        # espeak keeps global state, so only one thread may use a backend at a time
+        with backend_lock:
+            return backend.phonemize(texts, strip=options["strip"])
+
+    @classmethod
+    def version(cls, language="en-us", **options):
+        """
+        Get a stamp identifying the phonemizer settings and espeak version.
+
+        Stored alongside precomputed phonemes so they can be recomputed when
+        the settings or espeak change. Importing phonemizer and asking espeak for
+        its version is slow, so each stamp is only worked out once per process;
+        ModelRegistry's preload does it in the background.
+
+        Args:
+            language (str): espeak language code (default: "en-us").
+            **options: Overrides for DEFAULT_OPTIONS.
+
+        Returns:
+            str: The version stamp.
+        """
+        options_key = cls._options_key(language, {**cls.DEFAULT_OPTIONS, **options})
+        version = cls._versions.get(options_key)
+        if version is None:
+            from phonemizer.backend import EspeakBackend
+
+            espeak_version = ".".join(str(part) for part in EspeakBackend.version())
+            version = cls._versions[options_key] = f"espeak {espeak_version} {options_key}"
+        return version
+
+    @staticmethod
+    def _options_key(language, options):
+        """Build a stable string identifying the language and options."""
+        return json.dumps({"language": language, **options}, sort_keys=True)
+
+    @classmethod
+    def _remember(cls, key, phonemes):
+        """Add a result to the in-memory LRU cache, evicting the oldest if it is full."""
+        with cls._lock:
+            cls._memory[key] = phonemes
+            cls._memory.move_to_end(key)
+            while len(cls._memory) > cls.cache_size:
+                cls._memory.popitem(last=False)
+
+    @classmethod
+    def _connection(cls):
+        """Get this thread's pooled connection to the on-disk cache, creating the table if needed."""
+        connection = ConnectionManager.get_connection(cls.db_path)
+        if getattr(cls._local, "connection", None) is not connection:
+            connection.execute(
+                '''CREATE TABLE IF NOT EXISTS Phonemes (
+                    Text TEXT,
+                    Options TEXT,
+                    Phonemes TEXT,
+                    PRIMARY KEY (Text, Options)
+                )'''
+            )
+            connection.commit()
+            cls._local.connection = connection
+        return connection
+
+    @classmethod
+    def _load_many(cls, texts, options_key):
+        """Look texts up in the on-disk cache, returning a dict of the ones found."""
+        found = {}
+        try:
+            connection = cls._connection()
+            # Stay well under SQLite's limit on bound parameters
+            for start in range(0, len(texts), 500):
+                chunk = texts[start:start + 500]
+                rows = connection.execute(
+                    f"SELECT Text, Phonemes FROM Phonemes WHERE Options = ? AND Text IN ({', '.join('?' * len(chunk))})",
+                    (options_key, *chunk)
+                ).fetchall()
+                found.update(rows)
+        except sqlite3.Error as e:
+            print(f"Error reading phoneme cache: {e}")
+        return found
+
+    @classmethod
+    def _store_many(cls, items):
+        """Save (key, phonemes) pairs to the on-disk cache in one transaction."""
+        try:
+            connection = cls._connection()
+            connection.executemany(
+                "INSERT OR REPLACE INTO Phonemes (Text, Options, Phonemes) VALUES (?, ?, ?)",
+                [(*key, phonemes) for key, phonemes in items]
+            )
+            connection.commit()
+        except sqlite3.Error as e:
+            print(f"Error writing phoneme cache: {e}")
+
+    @classmethod
+    def get_stats(cls):
+        """
+        Get cache hit and miss counts since the process started.
+
+        Returns:
+            dict: memory_hits, disk_hits, misses, batches (espeak calls) and memory_size.
+        """
+        with cls._lock:
+            return {**cls._stats, "memory_size": len(cls._memory)}
+
+    @classmethod
+    def clear_cache(cls, disk=False):
+        """
+        Empty the in-memory cache, and optionally the on-disk one.
+
+        Args:
+            disk (bool): Also delete every cached result from the SQLite file.
+        """
+        with cls._lock:
+            cls._memory.clear()
+        if disk:
+            connection = cls._connection()
+            connection.execute("DELETE FROM Phonemes")
+            connection.commit()
@@ -1,14 +1,17 @@
 import tkinter as tk
 import sys
 from pathlib import Path
-from tkinter import Canvas, PhotoImage, Text, Toplevel, Button
-import re
-from audio import Audio
-from Feedback import Feedback
+from tkinter import Canvas, PhotoImage, Text, Toplevel, Button, messagebox
 from PIL import Image, ImageTk
 import time
-import sqlite3
+from threading import Thread
 from SharedData import SharedData
+from DatabaseManager import DatabaseManager
+from ModelRegistry import ModelRegistry
+from TranscriptionQueue import TranscriptionQueue
+from StoryDatabaseManager import StoryDatabaseManager
+from PhonemizerService import PhonemizerService
+from story import split_sentences
 
 class ReadingSession:
     """
@@ -21,13 +24,15 @@ class ReadingSession:
 
     story_ended = False
 
-    def __init__(self, story_text, master=None):
+    def __init__(self, story_text, master=None, story_id=None):
         """
         Initialize the ReadingSession.
 
         Args:
             story_text (str): The full text of the story.
             master (tk.Tk, optional): The main Tkinter window. Defaults to None.
+            story_id (int, optional): ID of the story in tinystories.db, used to look up
+                its precomputed phonemes. Defaults to None.
         """
         self.master = master if master else tk.Tk()
         self.feedback_window= None
@@ -38,36 +43,75 @@ class ReadingSession:
         self.total_time = 0
         self.word_count = 0
         self.total_correct_words = 0
-        self.sentences = re.split(r'(?<=[.!?]) +', story_text)
+        self.sentences = split_sentences(story_text)
+        # Sentences are phonemized live until the precomputed phonemes have loaded
+        self.story_phonemes = None
+        Thread(target=self.load_story_phonemes, args=(story_id,), daemon=True).start()
         self.expected_text = ""
-        self.recorder = Audio()
+        from audio import Audio
+        self.recorder = Audio(streaming=True, auto_stop_silence=3.0, on_stop_callback=self.request_auto_stop)
         self.button_next = None
         self.stop_recording_button= None
         self.start_recording_button= None
         self.images = {}  
         self.start_time = None 
+        self.pending_time = 0
+        self.transcription_job = None
+        self.auto_stop_requested = False
         self.setup_ui()
         self.load_images()
         self.create_buttons()
         self.display_current_line()
-        self.db_path = Path(__file__).parent.parent / "Database" / "READ_Database.db"
-        self.connection = None
-        self.cursor = None
+        self.wait_for_model()
+        self.db_manager = None
         self.connect_to_database()
         SharedData.set_session_status(True)
         
     def connect_to_database(self):
-        """Establish a connection to the SQLite database."""
+        """Take a handle on the pooled connection to the READ database."""
+        if self.db_manager is None:
+            self.db_manager = DatabaseManager()
+
+    def load_story_phonemes(self, story_id):
+        """
+        Load the story's precomputed phonemes, if they are current and match its sentences.
+
+        Runs on a background thread, since checking they are current needs the
+        phonemizer's version. They are stored in story_phonemes once loaded.
+
+        Args:
+            story_id (int): ID of the story in tinystories.db, or None.
+        """
+        if story_id is None:
+            return
+        story_db = StoryDatabaseManager()
         try:
-            self.connection = sqlite3.connect(self.db_path)
-            self.cursor = self.connection.cursor()
-        except sqlite3.Error as e:
-            print(f"Error connecting to database: {e}")
+            story_phonemes = story_db.get_story_phonemes(story_id, PhonemizerService.version())
+        except Exception as e:
+            print(f"Error loading precomputed phonemes: {e}")
+            story_phonemes = None
+        finally:
+            story_db.close_connection()
+        if story_phonemes is not None and [sentence for sentence, _, _ in story_phonemes] == self.sentences:
+            self.story_phonemes = story_phonemes
+
+    def get_sentence_phonemes(self):
+        """
+        Get the precomputed phonemes of the current sentence.
+
+        Returns:
+            tuple: The sentence phonemes and the list of word phonemes, or (None, None).
+        """
+        if self.story_phonemes is None or self.current_line >= len(self.story_phonemes):
+            return None, None
+        _, phonemes, word_phonemes = self.story_phonemes[self.current_line]
+        return phonemes, word_phonemes
 
     def close_database_connection(self):
-        """Close the database connection."""
-        if self.connection:
-            self.connection.close()
+        """Release the database connection back to the pool."""
+        if self.db_manager is not None:
+            self.db_manager.close_connection()
+            self.db_manager = None
 
     def __del__(self):
         """Destructor to ensure database connection is closed."""
@@ -109,6 +153,14 @@ class ReadingSession:
             fill="#000000",
             font=("Inter Medium", 40 * -1)
         )
+        self.status_text = self.canvas.create_text(
+            450.0,
+            530.0,
+            anchor="center",
+            text="",
+            fill="#000000",
+            font=("Inter Medium", 16 * -1)
+        )
         self.canvas.create_rectangle(
             20.0,
             142.0,
@@ -163,6 +215,26 @@ class ReadingSession:
             self.stop_recording_button.place(x=580.0, y=454.0, width=174.0, height=51.0)
             self.stop_recording_button.config(state="disabled")
 
+    def wait_for_model(self):
+        """Keep the record button disabled until the speech model has warmed up."""
+        ModelRegistry.start_warm_up()
+        if self.start_recording_button:
+            self.start_recording_button.config(state="disabled")
+        self.poll_model_status()
+
+    def poll_model_status(self):
+        """Check the speech model's warm-up progress and enable recording once it is ready."""
+        status, progress = ModelRegistry.get_status()
+        if status == "ready":
+            self.canvas.itemconfig(self.status_text, text="")
+            if self.start_recording_button:
+                self.start_recording_button.config(state="active")
+        elif status == "failed":
+            self.canvas.itemconfig(self.status_text, text="The speech model could not be loaded.")
+        else:
+            self.canvas.itemconfig(self.status_text, text=f"Getting ready to listen... {progress:.0%}")
+            self.master.after(200, self.poll_model_status)
+
     def display_current_line(self):
         """Display the current sentence of the story."""
         if self.current_line >= len(self.sentences):
@@ -172,6 +244,7 @@ class ReadingSession:
             self.text_widget.config(state=tk.DISABLED)
             self.button_next.config(state=tk.DISABLED)
             SharedData.set_session_status(False)
+            from Feedback import Feedback
             self.accuracy = Feedback.get_accuracy()
             self.insert_stats()
             self.total_time = 0
@@ -227,14 +300,95 @@ class ReadingSession:
         return Path(__file__).parent / "assets" / "frame2" / path
 
     def on_stop_recording(self):
-        """Handle stopping of audio recording."""
-        transcription = self.recorder.stop_recording()
+        """Handle stopping of audio recording and start analysing it in the background."""
+        frames = self.recorder.finish_recording()
+        self.pending_time = time.time() - self.start_time
+        self.stop_recording_button.config(state="disabled")
+        self.start_recording_button.config(state="active")  # Re-recording cancels the analysis
+        self.canvas.itemconfig(self.status_text, text="Listening to your reading...")
+        self.transcription_job = TranscriptionQueue.submit(
+            self.transcribe_and_score,
+            frames,
+            self.expected_text,
+            *self.get_sentence_phonemes(),
+            on_done=self.on_transcription_done,
+            on_error=self.on_transcription_error,
+            on_progress=self.on_transcription_progress
+        )
+        self.poll_transcription()
+
+    def transcribe_and_score(self, job, frames, expected_text, expected_phonemes=None, word_phonemes=None):
+        """
+        Transcribe a recording and score it against the expected text.
+
+        Runs on a TranscriptionQueue worker thread, so it must not touch any widgets.
+        Phonemes that were not precomputed are made here too, so the feedback window
+        never has to run espeak on the UI thread.
+
+        Args:
+            job (TranscriptionJob): The job running this function.
+            frames (list): Raw frames of the recording to analyse.
+            expected_text (str): The sentence the student was asked to read.
+            expected_phonemes (str, optional): Precomputed phonemes of the sentence.
+            word_phonemes (list, optional): Precomputed phonemes of each word of the sentence.
+
+        Returns:
+            tuple: The transcription, the list of word scores, the seconds spent
+            speaking, the sentence's phonemes and the phonemes of each of its words,
+            or None if cancelled.
+        """
+        job.report_progress(0.1, "Listening to your reading...")
+        transcription, speech_duration, logits, logits_offset = self.recorder.process_recording(frames)
+        if job.is_cancelled():
+            return None
+        job.report_progress(0.7, "Checking your words...")
+        if expected_phonemes is None:
+            expected_phonemes = self.recorder.expected_phonemes(expected_text)
+        if word_phonemes is None:
+            word_phonemes = PhonemizerService.phonemize_many(expected_text.split())
+        word_scores, word_alignments, _ = self.recorder.improved_compare_phonemes(
+            expected_text, transcription, expected_phonemes, logits, logits_offset
+        )
+        # Forced alignment times the words themselves, from the first to the last one read
+        aligned = [alignment for alignment in word_alignments or [] if alignment["start"] is not None]
+        if aligned:
+            speech_duration = aligned[-1]["end"] - aligned[0]["start"]
+        return transcription, word_scores, speech_duration, expected_phonemes, word_phonemes
+
+    def poll_transcription(self):
+        """Deliver background transcription results to the UI while a job is running."""
+        TranscriptionQueue.dispatch()
+        if self.transcription_job is not None and not self.transcription_job.is_finished():
+            self.master.after(100, self.poll_transcription)
+
+    def on_transcription_progress(self, progress, message):
+        """Show the progress of the background transcription."""
+        self.canvas.itemconfig(self.status_text, text=f"{message} {progress:.0%}")
+
+    def on_transcription_error(self, error):
+        """Report a failed transcription and let the student record again."""
+        print(f"Error processing recording: {error}")
+        self.transcription_job = None
+        self.canvas.itemconfig(self.status_text, text="Something went wrong, please record again.")
+        self.start_recording_button.config(state="active")
+
+    def on_transcription_done(self, result):
+        """Open the feedback window with the finished transcription and word scores."""
+        self.transcription_job = None
+        if result is None:
+            return
+        transcription, word_scores, speech_duration, expected_phonemes, word_phonemes = result
+        self.canvas.itemconfig(self.status_text, text="")
         self.button_next.config(state="active")
-        self.total_time += time.time() - self.start_time  
+        # Time reading speed by actual speech, falling back to the button timer if none was detected
+        self.total_time += speech_duration if speech_duration > 0 else self.pending_time
         if self.feedback_window is None or not self.feedback_window.is_alive():
-            self.feedback_window = Feedback(transcription, self.expected_text, self)
+            from Feedback import Feedback
+            self.feedback_window = Feedback(transcription, self.expected_text, self, word_scores=word_scores,
+                                            expected_phonemes=expected_phonemes, word_phonemes=word_phonemes)
         else:
-            self.feedback_window.update_content(transcription, self.expected_text)
+            self.feedback_window.update_content(transcription, self.expected_text, word_scores,
+                                                expected_phonemes, word_phonemes)
         self.feedback_window.show()
         self.master.withdraw()  # Hide the reading session window
 
@@ -244,11 +398,35 @@ class ReadingSession:
         self.set_button_states()
 
     def start_recording(self):
-        """Start audio recording."""
+        """Start audio recording, cancelling any analysis of the previous attempt."""
+        if self.transcription_job is not None:
+            self.transcription_job.cancel()
+            self.transcription_job = None
+            self.canvas.itemconfig(self.status_text, text="")
+        try:
+            self.recorder.start_recording()  # Start recording
+        except OSError as e:
+            messagebox.showerror("Microphone Error", f"Could not start recording: {e}")
+            return
         self.stop_recording_button.config(state="active")
         self.start_recording_button.config(state="disabled")
         self.start_time = time.time()  # Start the timer
-        self.recorder.start_recording()  # Start recording
+        self.auto_stop_requested = False
+        self.poll_auto_stop()
+
+    def request_auto_stop(self):
+        """Note that the recorder stopped itself after silence. Called from the capture thread."""
+        self.auto_stop_requested = True
+
+    def poll_auto_stop(self):
+        """Stop the recording on the UI thread once the recorder has detected sustained silence."""
+        if str(self.stop_recording_button["state"]) == "disabled":
+            return
+        if self.auto_stop_requested:
+            self.auto_stop_requested = False
+            self.on_stop_recording()
+        else:
+            self.master.after(100, self.poll_auto_stop)
         
     def set_button_states(self):
         """Set the states of buttons based on current action."""
@@ -270,22 +448,14 @@ class ReadingSession:
     
     def insert_stats(self):
         """Insert reading statistics into the database."""
-        if not self.cursor:
-            self.connect_to_database()
+        self.connect_to_database()
         
         self.speed = self.calculate_reading_speed()
         self.student = SharedData.get_student()
         self.student_id = self.student.student_id
 
         try:
-            self.cursor.execute(
-                '''INSERT INTO Stats (StudentID, AvgReadingSpeed, AvgAccuracy)
-                VALUES (?, ?, ?)''',
-                 (self.student_id, f"{self.speed:.1f}", f"{self.accuracy:.1f}")
-            )
-            self.connection.commit()
-        except sqlite3.Error as e:
-            print(f"Error inserting Stats into database: {e}")
+            self.db_manager.add_stats(self.student_id, self.speed, self.accuracy)
         finally:
             self.close_database_connection()
 
@@ -293,8 +463,8 @@ class ReadingSession:
         """Fetch and print session data from the database."""
         self.connect_to_database()
         try:
-            self.cursor.execute('SELECT * FROM Session')
-            rows = self.cursor.fetchall()
+            self.db_manager.cursor.execute('SELECT * FROM Session')
+            rows = self.db_manager.cursor.fetchall()
         finally:
             self.close_database_connection()
 
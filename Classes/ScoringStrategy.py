@@ -0,0 +1,217 @@
+import os
+from abc import ABC, abstractmethod
+import numpy as np
+from ForcedAligner import ForcedAligner, tokenize_phonemes
+from ModelRegistry import ModelRegistry
+from PhonemeAligner import phoneme_similarity
+from PhonemizerService import PhonemizerService
+from speechTest import difflib_phoneme_comparison, improved_phoneme_comparison
+
+
+class ScoringStrategy(ABC):
+    """
+    Word-level pronunciation scoring.
+
+    A strategy takes the sentence the student was asked to read and what the
+    recognizer heard, and scores each expected word between 0 (wrong) and 1
+    (correct). Subclasses implement score(); the model's logits are passed in
+    when they are available so frame-level strategies can use them. Strategies
+    that also time each word override score_with_alignments().
+
+    One strategy is shared by every transcription job of a recorder, so scoring
+    must not keep per-call results on the strategy.
+    """
+
+    name = None
+
+    @abstractmethod
+    def score(self, expected_text, recorded_phonemes, expected_phonemes=None, logits=None):
+        """
+        Score each word of a sentence.
+
+        Args:
+            expected_text (str): The sentence the student was asked to read.
+            recorded_phonemes (str): The phonemes the recognizer heard.
+            expected_phonemes (str, optional): Phonemes of the sentence, phonemized if not given.
+            logits (array, optional): CTC logits of shape (frames, vocabulary) for the recording.
+
+        Returns:
+            list: (word, score) tuples in reading order.
+        """
+
+    def score_with_alignments(self, expected_text, recorded_phonemes, expected_phonemes=None, logits=None):
+        """
+        Score each word of a sentence and time it in the recording, if the strategy can.
+
+        Takes the same arguments as score().
+
+        Returns:
+            tuple: The (word, score) tuples, and a list of per-word timings or None
+            if the strategy does not time words.
+        """
+        return self.score(expected_text, recorded_phonemes, expected_phonemes, logits), None
+
+    @staticmethod
+    def get_expected_phonemes(expected_text, expected_phonemes=None):
+        """Return the given phonemes, or phonemize the sentence if there are none."""
+        if expected_phonemes is None:
+            expected_phonemes = PhonemizerService.phonemize(expected_text, language='en-us')
+        return expected_phonemes
+
+
+class DifflibStrategy(ScoringStrategy):
+    """The original scorer: difflib matching blocks, then flexible_match on each word's segment."""
+
+    name = "difflib"
+
+    def score(self, expected_text, recorded_phonemes, expected_phonemes=None, logits=None):
+        return difflib_phoneme_comparison(expected_text, recorded_phonemes, expected_phonemes)
+
+
+class EditDistanceStrategy(ScoringStrategy):
+    """One similarity-weighted edit-distance alignment per sentence, see PhonemeAligner."""
+
+    name = "edit-distance"
+
+    def score(self, expected_text, recorded_phonemes, expected_phonemes=None, logits=None):
+        return improved_phoneme_comparison(expected_text, recorded_phonemes, expected_phonemes)
+
+
+class DTWStrategy(ScoringStrategy):
+    """
+    Dynamic time warping of the expected phonemes against the recognizer's frames.
+
+    The expected phonemes become a template of one-hot vectors, which fastdtw
+    aligns to the model's per-frame phoneme probabilities (blank frames dropped).
+    Each phoneme scores the highest probability the model gave it on the frames
+    aligned with it, and a word scores the mean over its phonemes. Without
+    logits, each recorded phoneme stands in for a frame, with its similarity to
+    every phoneme as the probabilities.
+    """
+
+    name = "dtw"
+
+    def score(self, expected_text, recorded_phonemes, expected_phonemes=None, logits=None):
+        from fastdtw import fastdtw
+        from scipy.spatial.distance import euclidean
+
+        expected_phonemes = self.get_expected_phonemes(expected_text, expected_phonemes)
+        words = list(zip(expected_text.split(), expected_phonemes.split()))
+        if logits is None:
+            word_tokens, frames = self.phoneme_frames(words, recorded_phonemes)
+        else:
+            word_tokens, frames = self.logit_frames(words, logits)
+
+        token_ids = [token for tokens in word_tokens for token in tokens]
+        if not token_ids or not len(frames):
+            return [(word, 0.0) for word, _ in words]
+
+        template = np.zeros((len(token_ids), frames.shape[1]))
+        template[np.arange(len(token_ids)), token_ids] = 1.0
+        _, path = fastdtw(template, frames, dist=euclidean)
+
+        best = np.zeros(len(token_ids))
+        for i, frame in path:
+            best[i] = max(best[i], frames[frame, token_ids[i]])
+
+        word_scores = []
+        start = 0
+        for (word, _), tokens in zip(words, word_tokens):
+            end = start + len(tokens)
+            word_scores.append((word, float(best[start:end].mean()) if tokens else 0.0))
+            start = end
+        return word_scores
+
+    @staticmethod
+    def phoneme_frames(words, recorded_phonemes):
+        """
+        Build frames from a phoneme string, one per recorded phoneme.
+
+        Returns:
+            tuple: Token IDs of each word's phonemes, and a (phonemes, alphabet) matrix
+            of similarities.
+        """
+        recorded = "".join(recorded_phonemes.split())
+        alphabet = sorted(set("".join(phonemes for _, phonemes in words)) | set(recorded))
+        ids = {phoneme: index for index, phoneme in enumerate(alphabet)}
+        word_tokens = [[ids[phoneme] for phoneme in phonemes] for _, phonemes in words]
+        frames = np.array([[phoneme_similarity(heard, phoneme) for phoneme in alphabet] for heard in recorded])
+        return word_tokens, frames.reshape(len(recorded), len(alphabet))
+
+    @staticmethod
+    def logit_frames(words, logits):
+        """
+        Build frames from the model's logits, dropping frames where blank is most likely.
+
+        Returns:
+            tuple: Token IDs of each word's phonemes, and a (frames, vocabulary) matrix
+            of probabilities.
+        """
+        tokenizer = ModelRegistry.get_processor().tokenizer
+        vocabulary = tokenizer.get_vocab()
+        word_tokens = [tokenize_phonemes(phonemes, vocabulary) for _, phonemes in words]
+
+        logits = np.asarray(logits, dtype=np.float64)
+        probabilities = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        probabilities /= probabilities.sum(axis=-1, keepdims=True)
+        return word_tokens, probabilities[probabilities.argmax(axis=-1) != tokenizer.pad_token_id]
+
+
+class ForcedAlignmentStrategy(ScoringStrategy):
+    """
+    CTC forced alignment of the expected phonemes against the logits, see ForcedAligner.
+
+    Scores come straight from the model's probabilities for the expected phonemes,
+    and score_with_alignments also returns each word's timing. Falls back to the edit-distance
+    strategy when no logits are given.
+    """
+
+    name = "forced-alignment"
+
+    def __init__(self):
+        self.aligner = None
+        self.fallback = EditDistanceStrategy()
+
+    def score(self, expected_text, recorded_phonemes, expected_phonemes=None, logits=None):
+        return self.score_with_alignments(expected_text, recorded_phonemes, expected_phonemes, logits)[0]
+
+    def score_with_alignments(self, expected_text, recorded_phonemes, expected_phonemes=None, logits=None):
+        if logits is None:
+            return self.fallback.score(expected_text, recorded_phonemes, expected_phonemes), None
+
+        if self.aligner is None:
+            tokenizer = ModelRegistry.get_processor().tokenizer
+            self.aligner = ForcedAligner(tokenizer.get_vocab(), tokenizer.pad_token_id)
+        expected_phonemes = self.get_expected_phonemes(expected_text, expected_phonemes)
+
+        logits = np.asarray(logits, dtype=np.float64)
+        log_probabilities = logits - logits.max(axis=-1, keepdims=True)
+        log_probabilities -= np.log(np.exp(log_probabilities).sum(axis=-1, keepdims=True))
+        alignments = self.aligner.align_words(
+            log_probabilities, expected_text.split(), expected_phonemes.split()
+        )
+        return [(alignment["word"], alignment["confidence"]) for alignment in alignments], alignments
+
+
+STRATEGIES = {
+    DifflibStrategy.name: DifflibStrategy,
+    EditDistanceStrategy.name: EditDistanceStrategy,
+    DTWStrategy.name: DTWStrategy,
+    ForcedAlignmentStrategy.name: ForcedAlignmentStrategy,
+}
+
+
+def create_strategy(name=None):
+    """
+    Create a scoring strategy from its name or the environment.
+
+    Args:
+        name (str, optional): Strategy name. Defaults to READ_SCORING_STRATEGY, then "edit-distance".
+
+    Returns:
+        ScoringStrategy: The strategy.
+    """
+    name = name or os.environ.get("READ_SCORING_STRATEGY", EditDistanceStrategy.name)
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown scoring strategy '{name}', expected one of {', '.join(STRATEGIES)}")
+    return STRATEGIES[name]()
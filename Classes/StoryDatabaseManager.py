@@ -1,26 +1,45 @@
 import sqlite3
-from pathlib import Path
+import threading
 from tkinter import messagebox
+from ConnectionManager import ConnectionManager
+
+# Hot query, checked by checkQueryPlans.py to be answered from an index
+STORIES_BY_DIFFICULTY = "SELECT id, title, excerpt, difficulty FROM Stories WHERE difficulty = ? LIMIT ?"
 
 class StoryDatabaseManager:
     def __init__(self, db_path: str = None):
         # Initialize the database connection.
         if db_path is None:
-            db_path = Path(__file__).parent.parent / "Database" / "tinystories.db"
+            db_path = ConnectionManager.STORY_DATABASE
         self.db_path = db_path
-        self.connection = None
-        self.cursor = None
+        # The connection is pooled per thread, see ConnectionManager; each thread gets its own cursor
+        self._local = threading.local()
+        self._acquired = False
         self.connect()
 
     def connect(self):
-        #Establish a connection to the database.
+        #Take a handle on this thread's pooled connection to the database.
+        if self._acquired:
+            return
         try:
-            self.connection = sqlite3.connect(self.db_path)
-            self.cursor = self.connection.cursor()
+            ConnectionManager.acquire(self.db_path)
+            self._acquired = True
         except sqlite3.Error as e:
             print(f"Error connecting to database: {e}")
             raise
 
+    @property
+    def connection(self):
+        return ConnectionManager.get_connection(self.db_path)
+
+    @property
+    def cursor(self):
+        connection = self.connection
+        if getattr(self._local, "connection", None) is not connection:
+            self._local.connection = connection
+            self._local.cursor = connection.cursor()
+        return self._local.cursor
+
     def get_story_excerpts(self, num_stories=9):
         try:
             query = "SELECT id, title, excerpt, difficulty FROM stories LIMIT ?"
@@ -31,8 +50,7 @@ class StoryDatabaseManager:
             return []
 
     def get_story_excerpts_by_reading_level(self, reading_level, num_stories=3):
-        query = "SELECT id, title, excerpt, difficulty FROM Stories WHERE difficulty = ? LIMIT ?"
-        self.cursor.execute(query, (reading_level, num_stories))
+        self.cursor.execute(STORIES_BY_DIFFICULTY, (reading_level, num_stories))
         
         return self.cursor.fetchall()
     
@@ -60,17 +78,70 @@ class StoryDatabaseManager:
         self.connection.commit()
         messagebox.showinfo("Story Removed", f"Story with ID {story_id} removed successfully!")
 
+    def get_all_story_bodies(self):
+        try:
+            self.cursor.execute("SELECT id, body FROM stories")
+            return self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Error fetching stories: {e}")
+            return []
+
+    def get_phonemes_version(self, story_id: int):
+        # Version stamp of the story's precomputed phonemes, or None if there are none.
+        try:
+            self.cursor.execute("SELECT MIN(version) FROM story_sentences WHERE story_id = ?", (story_id,))
+            return self.cursor.fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+    def save_story_phonemes(self, story_id: int, sentences, version: str):
+        # sentences is a list of (sentence, phonemes, [(word, word_phonemes), ...]) in reading order.
+        try:
+            self.cursor.execute("DELETE FROM story_sentences WHERE story_id = ?", (story_id,))
+            self.cursor.execute("DELETE FROM story_words WHERE story_id = ?", (story_id,))
+            for sentence_index, (sentence, phonemes, words) in enumerate(sentences):
+                self.cursor.execute(
+                    "INSERT INTO story_sentences (story_id, sentence_index, sentence, phonemes, version) VALUES (?, ?, ?, ?, ?)",
+                    (story_id, sentence_index, sentence, phonemes, version)
+                )
+                self.cursor.executemany(
+                    "INSERT INTO story_words (story_id, sentence_index, word_index, word, phonemes) VALUES (?, ?, ?, ?, ?)",
+                    [(story_id, sentence_index, word_index, word, word_phonemes)
+                     for word_index, (word, word_phonemes) in enumerate(words)]
+                )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"Error saving story phonemes: {e}")
+            self.connection.rollback()
+
+    def get_story_phonemes(self, story_id: int, version: str):
+        # Precomputed (sentence, phonemes, [word_phonemes, ...]) per sentence, or None if
+        # the story has not been precomputed with this phonemizer version.
+        try:
+            self.cursor.execute(
+                "SELECT sentence_index, sentence, phonemes FROM story_sentences WHERE story_id = ? AND version = ? ORDER BY sentence_index",
+                (story_id, version)
+            )
+            sentences = self.cursor.fetchall()
+            if not sentences:
+                return None
+            self.cursor.execute(
+                "SELECT sentence_index, phonemes FROM story_words WHERE story_id = ? ORDER BY sentence_index, word_index",
+                (story_id,)
+            )
+            words = {}
+            for sentence_index, phonemes in self.cursor.fetchall():
+                words.setdefault(sentence_index, []).append(phonemes)
+            return [(sentence, phonemes, words.get(sentence_index, [])) for sentence_index, sentence, phonemes in sentences]
+        except sqlite3.Error as e:
+            print(f"Error fetching story phonemes: {e}")
+            return None
+
     def close_connection(self):
-        if self.cursor:
-            try:
-                self.cursor.close()
-            except sqlite3.ProgrammingError:
-                print("Cursor is already closed.")
-        if self.connection:
-            try:
-                self.connection.close()
-            except sqlite3.ProgrammingError:
-                print("Connection is already closed.")
+        # Give the pooled connection back; it stays open for the other screens.
+        if self._acquired:
+            ConnectionManager.release(self.db_path)
+            self._acquired = False
 
     def __del__(self):
         self.close_connection()
@@ -0,0 +1,87 @@
+from math import ceil, gcd
+import numpy as np
+
+
+class StreamResampler:
+    """
+    Polyphase resampling of audio that arrives a slice at a time.
+
+    Resampling each slice on its own zero-pads both of its ends, which puts filter
+    edge artifacts into the audio at every slice boundary. Instead, incoming audio
+    is kept in a buffer with enough context on either side of the filter, and only
+    the output samples whose whole filter support has arrived are emitted. The
+    result is the same as resampling the whole recording in one go.
+    """
+
+    def __init__(self, rate, target_rate):
+        """
+        Initialize the StreamResampler.
+
+        Args:
+            rate (int): Sample rate of the incoming audio.
+            target_rate (int): Sample rate to convert to.
+        """
+        divisor = gcd(rate, target_rate)
+        self.up, self.down = target_rate // divisor, rate // divisor
+        # Input samples on either side of an output sample that its filter reaches
+        # (resample_poly's default filter is 10 zero crossings of the slower rate wide)
+        reach = ceil(10 * max(self.up, self.down) / self.up) + 1
+        # Buffers start on a multiple of down, so their first output sample is whole
+        self.context = ceil(reach / self.down) * self.down
+        self.reset()
+
+    def reset(self):
+        """Forget the buffered audio and start a new stream."""
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._start = 0  # Input index of the first buffered sample
+        self._emitted = 0  # Output samples returned so far
+
+    def process(self, audio):
+        """
+        Add a slice of audio and get the resampled audio that is now complete.
+
+        Args:
+            audio (numpy.ndarray): Mono float samples at the incoming rate.
+
+        Returns:
+            numpy.ndarray: Float32 samples at the target rate.
+        """
+        if self.up == self.down:
+            return audio
+        self._buffer = np.concatenate([self._buffer, audio.astype(np.float32)])
+        # Outputs are complete once the filter's right-hand side has arrived
+        end = self._start + len(self._buffer) - self.context
+        return self._emit((max(0, end) * self.up) // self.down)
+
+    def flush(self):
+        """
+        Resample the audio still held back at the end of the stream.
+
+        Returns:
+            numpy.ndarray: The last float32 samples at the target rate.
+        """
+        if self.up == self.down:
+            return np.zeros(0, dtype=np.float32)
+        total = -(-(self._start + len(self._buffer)) * self.up // self.down)
+        output = self._emit(total)
+        self.reset()
+        return output
+
+    def _emit(self, last):
+        """Resample the buffer and return output samples [emitted, last), dropping spent input."""
+        if last <= self._emitted:
+            return np.zeros(0, dtype=np.float32)
+        from scipy.signal import resample_poly
+
+        first_output = self._start * self.up // self.down
+        resampled = resample_poly(self._buffer, self.up, self.down)
+        output = resampled[self._emitted - first_output:last - first_output].astype(np.float32)
+        self._emitted = last
+
+        # Keep enough input before the next output sample for its left-hand context
+        keep_from = max(0, (self._emitted * self.down) // self.up - self.context)
+        keep_from -= keep_from % self.down
+        if keep_from > self._start:
+            self._buffer = self._buffer[keep_from - self._start:]
+            self._start = keep_from
+        return output
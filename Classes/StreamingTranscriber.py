@@ -0,0 +1,224 @@
+import threading
+import numpy as np
+from ModelRegistry import ModelRegistry
+from BatchTranscriber import BatchTranscriber
+
+
+class StreamingTranscriber:
+    """
+    Incremental Wav2Vec2 transcription of a recording that is still growing.
+
+    Audio is fed in as it is captured and transcribed in fixed-size chunks. Each
+    chunk is run through the model together with some context on either side, and
+    only the frames that belong to the chunk itself are kept, so the CTC outputs of
+    consecutive windows can simply be concatenated. When the recording stops only
+    the final partial chunk is left to transcribe. The committed frames' logits
+    are kept too, for scoring that works on the model's output directly.
+
+    With a VoiceActivityDetector, leading and trailing silence is trimmed like a
+    batch recording's: chunks outside the speech found in the whole recording so
+    far are not run through the model.
+    """
+
+    RATE = 16000
+    SAMPLES_PER_FRAME = 320  # Wav2Vec2 emits one CTC frame per 20 ms of 16 kHz audio
+    MIN_SAMPLES = 400  # Receptive field of the first frame
+
+    def __init__(self, chunk_seconds=2.0, context_seconds=0.5, vad=None):
+        """
+        Initialize the StreamingTranscriber.
+
+        Args:
+            chunk_seconds (float): Length of audio committed by each window (default: 2.0).
+            context_seconds (float): Overlap added on both sides of each window (default: 0.5).
+            vad (VoiceActivityDetector, optional): When given, chunks before the first or
+                after the last speech in the recording, and windows with no frame above its
+                absolute minimum level, are skipped instead of being run through the model.
+        """
+        self.vad = vad
+        self.chunk = self._to_frame_multiple(chunk_seconds)
+        self.context = self._to_frame_multiple(context_seconds)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def _to_frame_multiple(self, seconds):
+        """Convert seconds to a whole number of model frames worth of samples."""
+        frames = max(1, int(round(seconds * self.RATE / self.SAMPLES_PER_FRAME)))
+        return frames * self.SAMPLES_PER_FRAME
+
+    def reset(self):
+        """Discard all audio and hypotheses and start a new recording."""
+        with self._lock:
+            self._blocks = []
+            self._samples = np.zeros(0, dtype=np.float32)
+            self._committed = 0
+            self._ids = []
+            self._logits = []
+
+    def add_audio(self, audio):
+        """
+        Append newly captured audio.
+
+        Args:
+            audio (numpy.ndarray): Mono float32 samples at 16 kHz.
+        """
+        with self._lock:
+            self._blocks.append(audio)
+
+    def _gather(self):
+        """Merge newly added blocks into the sample buffer. Caller holds the lock."""
+        if self._blocks:
+            self._samples = np.concatenate([self._samples] + self._blocks)
+            self._blocks = []
+
+    def process_available(self):
+        """
+        Transcribe every complete chunk whose right-hand context has arrived.
+
+        Returns:
+            int: The number of windows run through the model.
+        """
+        with self._lock:
+            self._gather()
+            return self._commit_ready_chunks()
+
+    def finish(self):
+        """
+        Transcribe the remaining audio and return the full transcription.
+
+        Returns:
+            str: The phoneme transcription of everything added since the last reset.
+        """
+        with self._lock:
+            self._gather()
+            span = self._commit_ready_chunks(final=True)
+            if len(self._samples) - self._committed >= self.SAMPLES_PER_FRAME:
+                self._ids.extend(self._transcribe_window(self._committed, len(self._samples), span))
+                self._committed = len(self._samples)
+            return self._decode(self._ids)
+
+    def _commit_ready_chunks(self, final=False):
+        """
+        Transcribe complete chunks that have their right context. Caller holds the lock.
+
+        Args:
+            final (bool): The recording has stopped, so nothing is held back.
+
+        Returns:
+            int or tuple: The number of windows run through the model, or when final
+            the speech span used, for the last partial chunk.
+        """
+        span = self._speech_span()
+        if span is None:
+            if not final:
+                return 0  # Wait until speech can be told apart from steady noise
+            span = (0, len(self._samples))
+        windows = 0
+        while self._committed + self.chunk + self.context <= len(self._samples):
+            start = self._committed
+            self._ids.extend(self._transcribe_window(start, start + self.chunk, span))
+            self._committed += self.chunk
+            windows += 1
+        return span if final else windows
+
+    def _speech_span(self):
+        """
+        Find the speech in the audio so far, with the VAD's padding. Caller holds the lock.
+
+        The noise floor is estimated from the whole recording so far, never from
+        one window, so a window read all the way through is never mistaken for silence.
+
+        Returns:
+            tuple: (start, end) samples of the padded speech, which is empty if nothing
+            is above the VAD's minimum level yet. None while every frame is at one steady
+            level, when speech cannot be told apart from noise.
+        """
+        if self.vad is None:
+            return 0, len(self._samples)
+        mask = self.vad.speech_mask(self._samples)
+        if len(mask) and mask.all():
+            return None
+        bounds = self.vad.find_speech(self._samples)
+        if bounds is None:
+            return len(self._samples), len(self._samples)
+        start, end = bounds
+        return max(0, start - self.vad.padding), end + self.vad.padding
+
+    def get_audio(self):
+        """
+        Get all audio added since the last reset.
+
+        Returns:
+            numpy.ndarray: Mono float32 samples at 16 kHz.
+        """
+        with self._lock:
+            self._gather()
+            return self._samples
+
+    def get_logits(self):
+        """
+        Get the logits of every frame committed since the last reset.
+
+        Windows skipped as silent are filled with frames where blank is certain,
+        so frame indexes stay in step with time in the recording.
+
+        Returns:
+            numpy.ndarray: Logits of shape (frames, vocabulary), or None if nothing was transcribed.
+        """
+        with self._lock:
+            if not self._logits:
+                return None
+            return np.concatenate(self._logits)
+
+    def get_hypothesis(self):
+        """
+        Get the running transcription of the audio processed so far.
+
+        Does not wait for a window that is currently being transcribed.
+
+        Returns:
+            str: The phoneme transcription of all committed chunks.
+        """
+        return self._decode(list(self._ids))
+
+    def _transcribe_window(self, start, end, span):
+        """
+        Run the model over [start, end) plus context and return that span's frame ids.
+
+        Args:
+            start (int): First sample of the span to commit.
+            end (int): Sample after the last one to commit.
+            span (tuple): (start, end) samples of the speech, see _speech_span. Spans
+                entirely outside it are filled with blanks instead.
+
+        Returns:
+            list: The greedy CTC token ids for the committed frames. Their logits are
+            added to the kept ones.
+        """
+        window_start = max(0, start - self.context)
+        window_end = min(len(self._samples), end + self.context)
+        window = self._samples[window_start:window_end]
+        if len(window) < self.MIN_SAMPLES:
+            return []
+
+        processor = ModelRegistry.get_processor()
+        first = (start - window_start) // self.SAMPLES_PER_FRAME
+        count = (end - start) // self.SAMPLES_PER_FRAME
+        # Skip leading and trailing silence, and windows that are quiet in absolute terms
+        outside_speech = end <= span[0] or start >= span[1]
+        if outside_speech or (self.vad is not None and not self.vad.has_sound(window)):
+            silence = np.full((count, ModelRegistry.get_model().config.vocab_size), -30.0, dtype=np.float32)
+            silence[:, processor.tokenizer.pad_token_id] = 0.0
+            self._logits.append(silence)
+            # Keep a blank between the neighbouring windows' tokens so they don't merge
+            return [processor.tokenizer.pad_token_id]
+
+        logits = BatchTranscriber.logits(window, label="stream")[first:first + count]
+        self._logits.append(logits.numpy())
+        return logits.argmax(dim=-1).tolist()
+
+    def _decode(self, ids):
+        """Collapse concatenated CTC ids into a transcription."""
+        if not ids:
+            return ""
+        return ModelRegistry.get_processor().decode(ids)
@@ -0,0 +1,153 @@
+import queue
+import threading
+import itertools
+
+
+class TranscriptionJob:
+    """
+    A unit of background work submitted to the TranscriptionQueue.
+
+    The job function runs on a worker thread and receives the job as its first
+    argument so it can report progress and check whether it has been cancelled.
+    Callbacks are never run on the worker thread; they are delivered by
+    TranscriptionQueue.dispatch() on whichever thread calls it (the Tk main loop).
+    """
+
+    def __init__(self, job_id, func, args, on_done=None, on_error=None, on_progress=None):
+        """
+        Initialize a TranscriptionJob.
+
+        Args:
+            job_id (int): Unique identifier for the job.
+            func (function): Function to run in the background, called as func(job, *args).
+            args (tuple): Extra positional arguments for func.
+            on_done (function, optional): Called with the function's result.
+            on_error (function, optional): Called with the exception if func raises.
+            on_progress (function, optional): Called with (progress, message) updates.
+        """
+        self.job_id = job_id
+        self.func = func
+        self.args = args
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+
+    def cancel(self):
+        """Cancel the job. Pending jobs are skipped and no further callbacks are delivered."""
+        self._cancelled.set()
+        self._finished.set()
+
+    def is_cancelled(self):
+        """Return True if the job has been cancelled."""
+        return self._cancelled.is_set()
+
+    def is_finished(self):
+        """Return True once the job's final callback has been delivered or it was cancelled."""
+        return self._finished.is_set()
+
+    def report_progress(self, progress, message=""):
+        """
+        Report progress from inside the job function.
+
+        Args:
+            progress (float): Fraction of the work completed, between 0 and 1.
+            message (str, optional): Short description of the current stage.
+        """
+        if not self.is_cancelled():
+            TranscriptionQueue._results.put(("progress", self, (progress, message)))
+
+
+class TranscriptionQueue:
+    """
+    Process-wide job queue that runs transcription and scoring off the Tk thread.
+
+    Jobs are started in submission order by a small pool of worker threads, so that
+    recordings finishing together can share a BatchTranscriber batch. Results,
+    errors and progress updates are posted to a thread-safe result queue and handed
+    to the job's callbacks when the UI thread calls dispatch(), typically from a
+    master.after() polling loop.
+    """
+
+    _jobs = queue.Queue()
+    _results = queue.Queue()
+    _workers = []
+    _num_workers = 4
+    _ids = itertools.count(1)
+    _lock = threading.Lock()
+
+    @classmethod
+    def submit(cls, func, *args, on_done=None, on_error=None, on_progress=None):
+        """
+        Queue a function to run in the background.
+
+        Args:
+            func (function): Function to run, called as func(job, *args).
+            *args: Extra positional arguments for func.
+            on_done (function, optional): Called on the UI thread with the result.
+            on_error (function, optional): Called on the UI thread with the exception.
+            on_progress (function, optional): Called on the UI thread with (progress, message).
+
+        Returns:
+            TranscriptionJob: The queued job, which can be cancelled.
+        """
+        job = TranscriptionJob(next(cls._ids), func, args, on_done, on_error, on_progress)
+        cls._ensure_workers()
+        cls._jobs.put(job)
+        return job
+
+    @classmethod
+    def _ensure_workers(cls):
+        """Start the worker threads the first time a job is submitted."""
+        with cls._lock:
+            cls._workers = [worker for worker in cls._workers if worker.is_alive()]
+            while len(cls._workers) < cls._num_workers:
+                worker = threading.Thread(target=cls._work, daemon=True)
+                worker.start()
+                cls._workers.append(worker)
+
+    @classmethod
+    def _work(cls):
+        """Worker loop: run queued jobs and post their outcome to the result queue."""
+        while True:
+            job = cls._jobs.get()
+            try:
+                if job.is_cancelled():
+                    continue
+                try:
+                    result = job.func(job, *job.args)
+                except Exception as e:
+                    cls._results.put(("error", job, e))
+                else:
+                    cls._results.put(("done", job, result))
+            finally:
+                cls._jobs.task_done()
+
+    @classmethod
+    def dispatch(cls):
+        """
+        Deliver pending results to their callbacks. Must be called from the UI thread.
+
+        Callbacks of cancelled jobs are dropped.
+        """
+        while True:
+            try:
+                kind, job, payload = cls._results.get_nowait()
+            except queue.Empty:
+                return
+            if job.is_cancelled():
+                continue
+            if kind == "progress":
+                if job.on_progress:
+                    job.on_progress(*payload)
+            elif kind == "done":
+                job._finished.set()
+                if job.on_done:
+                    job.on_done(payload)
+            elif kind == "error":
+                job._finished.set()
+                if job.on_error:
+                    job.on_error(payload)
+                else:
+                    print(f"Error in background transcription job {job.job_id}: {payload}")
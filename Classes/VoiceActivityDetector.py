@@ -0,0 +1,171 @@
+import numpy as np
+
+
+class VoiceActivityDetector:
+    """
+    Energy-based voice activity detection for 16 kHz recordings.
+
+    A frame counts as speech when its level is well above the recording's noise
+    floor (estimated from its quietest frames) and above an absolute minimum. Used
+    to trim leading and trailing silence before inference, to measure how long the
+    student actually spoke, and to notice sustained silence while recording.
+    """
+
+    RATE = 16000
+
+    def __init__(self, frame_seconds=0.03, min_level_db=-50.0, margin_db=15.0, padding_seconds=0.2):
+        """
+        Initialize the VoiceActivityDetector.
+
+        Args:
+            frame_seconds (float): Length of each analysis frame (default: 0.03).
+            min_level_db (float): Frames quieter than this are never speech (default: -50.0).
+            margin_db (float): How far above the noise floor speech must be (default: 15.0).
+            padding_seconds (float): Audio kept on either side of detected speech when
+                trimming, so word onsets are not clipped (default: 0.2).
+        """
+        self.frame_length = int(frame_seconds * self.RATE)
+        self.min_level_db = min_level_db
+        self.margin_db = margin_db
+        self.padding = int(padding_seconds * self.RATE)
+        self.reset()
+
+    def reset(self):
+        """Forget the noise floor tracked by is_speech for the previous recording."""
+        self.noise_floor_db = None
+
+    @staticmethod
+    def level_db(audio):
+        """
+        Get the RMS level of a block of audio.
+
+        Args:
+            audio (numpy.ndarray): Float samples in [-1, 1).
+
+        Returns:
+            float: The level in dBFS.
+        """
+        if len(audio) == 0:
+            return -120.0
+        rms = np.sqrt(np.mean(np.square(audio, dtype=np.float64)))
+        return 20 * np.log10(max(rms, 1e-6))
+
+    def frame_levels(self, audio):
+        """
+        Get the RMS level of every analysis frame.
+
+        Args:
+            audio (numpy.ndarray): Mono float samples at 16 kHz.
+
+        Returns:
+            numpy.ndarray: Level of each complete frame in dBFS.
+        """
+        count = len(audio) // self.frame_length
+        if count == 0:
+            return np.zeros(0)
+        frames = audio[:count * self.frame_length].reshape(count, self.frame_length).astype(np.float64)
+        rms = np.sqrt(np.mean(np.square(frames), axis=1))
+        return 20 * np.log10(np.maximum(rms, 1e-6))
+
+    def speech_mask(self, audio):
+        """
+        Classify every analysis frame as speech or silence.
+
+        Args:
+            audio (numpy.ndarray): Mono float samples at 16 kHz.
+
+        Returns:
+            numpy.ndarray: Boolean array, True for speech frames.
+        """
+        levels = self.frame_levels(audio)
+        if len(levels) == 0:
+            return np.zeros(0, dtype=bool)
+        noise_floor = np.percentile(levels, 10)
+        speech = levels > max(self.min_level_db, noise_floor + self.margin_db)
+        if not speech.any():
+            # No quiet frames to measure a floor from means speech throughout, or silence
+            speech = levels > self.min_level_db
+        return speech
+
+    def find_speech(self, audio):
+        """
+        Find where speech starts and ends.
+
+        Args:
+            audio (numpy.ndarray): Mono float samples at 16 kHz.
+
+        Returns:
+            tuple: (start, end) sample indices of the speech, or None if there is none.
+        """
+        speech = np.flatnonzero(self.speech_mask(audio))
+        if len(speech) == 0:
+            return None
+        start = speech[0] * self.frame_length
+        end = (speech[-1] + 1) * self.frame_length
+        return start, end
+
+    def trim(self, audio):
+        """
+        Remove leading and trailing silence, keeping a little padding.
+
+        Args:
+            audio (numpy.ndarray): Mono float samples at 16 kHz.
+
+        Returns:
+            numpy.ndarray: The trimmed audio, or the input unchanged if no speech was found.
+        """
+        bounds = self.find_speech(audio)
+        if bounds is None:
+            return audio
+        start, end = bounds
+        return audio[max(0, start - self.padding):min(len(audio), end + self.padding)]
+
+    def speech_duration(self, audio):
+        """
+        Measure the time from the first to the last detected speech.
+
+        Args:
+            audio (numpy.ndarray): Mono float samples at 16 kHz.
+
+        Returns:
+            float: The speaking time in seconds, 0 if no speech was found.
+        """
+        bounds = self.find_speech(audio)
+        if bounds is None:
+            return 0.0
+        start, end = bounds
+        return (end - start) / self.RATE
+
+    def has_sound(self, audio):
+        """
+        Check whether any frame of a block is louder than the absolute minimum.
+
+        Unlike find_speech, this does not estimate a noise floor from the block
+        itself, so a block where the student speaks throughout still counts. Used to
+        decide whether a streaming window can skip the model.
+
+        Args:
+            audio (numpy.ndarray): Mono float samples at 16 kHz.
+
+        Returns:
+            bool: True if the block may contain speech.
+        """
+        levels = self.frame_levels(audio)
+        if len(levels) == 0:
+            return self.level_db(audio) > self.min_level_db
+        return bool(np.any(levels > self.min_level_db))
+
+    def is_speech(self, audio):
+        """
+        Classify one block of a live recording, tracking its noise floor as it goes.
+
+        Args:
+            audio (numpy.ndarray): Float samples of the newest block.
+
+        Returns:
+            bool: True if the block contains speech.
+        """
+        level = self.level_db(audio)
+        if self.noise_floor_db is None or level < self.noise_floor_db:
+            self.noise_floor_db = level
+        return level > max(self.min_level_db, self.noise_floor_db + self.margin_db)
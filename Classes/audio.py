@@ -1,29 +1,44 @@
 import os
 import warnings
 import logging
-import transformers
-from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
-import torch
-from phonemizer import phonemize
-import librosa
+import numpy as np
 import pyaudio
 import wave
+from math import gcd
+import time
 from threading import Thread
-import string
-import difflib
-from fastdtw import fastdtw
-from scipy.spatial.distance import euclidean
-from speechTest import improved_phoneme_comparison,provide_feedback
+from speechTest import build_feedback
+from ScoringStrategy import create_strategy
+from ModelRegistry import ModelRegistry
+from PhonemizerService import PhonemizerService
+from StreamingTranscriber import StreamingTranscriber
+from BatchTranscriber import BatchTranscriber
+from VoiceActivityDetector import VoiceActivityDetector
+from StreamResampler import StreamResampler
 
 # Suppress unnecessary logs and warnings
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
 os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
 warnings.filterwarnings("ignore")
-transformers.logging.set_verbosity_error()
 logging.basicConfig(level=logging.CRITICAL)
 
 
+class Recording(list):
+    """
+    The raw frames of one recording.
+
+    In streaming mode the recording also carries the transcriber that its stream
+    thread feeds, so a new recording never shares one with a recording that is
+    still being transcribed in the background.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.transcriber = None
+        self.stream_thread = None
+
+
 class Audio:
     """
     A class for handling audio recording, transcription, and phoneme comparison.
@@ -31,17 +46,29 @@ class Audio:
     This class provides functionality to record audio, transcribe it using a pre-trained
     model, and compare the transcription with expected text using phoneme-based analysis.
     """
-    def __init__(self, output_filename="Recorded.wav", format=pyaudio.paInt16, channels=2, rate=44100, chunk=1024, on_stop_callback=None):
+    MODEL_RATE = 16000
+
+    def __init__(self, output_filename="Recorded.wav", format=pyaudio.paInt16, channels=1, rate=MODEL_RATE, chunk=1024, on_stop_callback=None, archive=False, streaming=False, auto_stop_silence=None, scoring=None):
         """
         Initialize the Audio class.
 
         Args:
-            output_filename (str): Name of the output audio file.
+            output_filename (str): Name of the audio file recordings are archived to.
             format (int): Audio format (default: pyaudio.paInt16).
-            channels (int): Number of audio channels (default: 2).
-            rate (int): Sample rate (default: 44100).
+            channels (int): Preferred number of audio channels (default: 1).
+            rate (int): Preferred sample rate (default: 16000). The device may not support it,
+                see negotiate_capture_format.
             chunk (int): Buffer size (default: 1024).
-            on_stop_callback (function): Callback function when recording stops.
+            on_stop_callback (function): Called from the capture thread when the recording
+                stops itself after sustained silence.
+            archive (bool): Also save each recording to output_filename (default: False).
+                Transcription never reads the file back.
+            streaming (bool): Transcribe overlapping windows while recording so that
+                stopping only has to finish the last one (default: False).
+            auto_stop_silence (float, optional): Stop recording after this many seconds of
+                silence once the student has started speaking (default: None, never).
+            scoring (str, optional): Name of the ScoringStrategy used to score words
+                (default: READ_SCORING_STRATEGY, then "edit-distance").
         """
         self.chunk = chunk
         self.format = format
@@ -50,33 +77,161 @@ class Audio:
         self.output_filename = os.path.join(os.path.dirname(__file__), output_filename)
         self.p = pyaudio.PyAudio()
         self.stream = None
-        self.frames = []
+        self.frames = Recording()
+        self.record_thread = None
         self.is_recording = False
         self.on_stop_callback = on_stop_callback 
+        self.archive = archive
+        self.capture_path = None
+        self.streaming = streaming
+        self.stream_thread = None
+        self.vad = VoiceActivityDetector()
+        self.transcriber = None
+        self.auto_stop_silence = auto_stop_silence
+        self.scoring = create_strategy(scoring)
+
+    @property
+    def model(self):
+        """The shared pre-trained model, borrowed from the ModelRegistry."""
+        return ModelRegistry.get_model()
+
+    @property
+    def processor(self):
+        """The shared pre-trained processor, borrowed from the ModelRegistry."""
+        return ModelRegistry.get_processor()
 
-        # Load the pre-trained model and processor
-        self.model = Wav2Vec2ForCTC.from_pretrained("facebook/wav2vec2-xlsr-53-espeak-cv-ft")
-        self.processor = Wav2Vec2Processor.from_pretrained("facebook/wav2vec2-xlsr-53-espeak-cv-ft")
+    def negotiate_capture_format(self):
+        """
+        Pick the capture format closest to what the model needs.
+
+        The preferred rate and channel count (16 kHz mono by default) are used when the
+        input device supports them. Otherwise the device's own rate is used, in mono if
+        possible, and recordings are resampled with a polyphase filter, which reduces
+        to plain decimation when the rates divide evenly (e.g. 48 kHz).
+
+        Returns:
+            str: The path taken: "native", "integer-ratio" or "polyphase", or None if
+            there is no input device or it supports none of the candidate formats.
+        """
+        try:
+            device = self.p.get_default_input_device_info()
+        except IOError as e:
+            print(f"Error finding the microphone: no default input device ({e})")
+            self.capture_path = None
+            return None
+
+        device_rate = int(device["defaultSampleRate"])
+        candidates = [(self.rate, self.channels), (self.rate, 1), (device_rate, 1), (device_rate, 2)]
+        for rate, channels in candidates:
+            if channels > device["maxInputChannels"]:
+                continue
+            try:
+                self.p.is_format_supported(rate, input_device=device["index"],
+                                           input_channels=channels, input_format=self.format)
+            except ValueError:
+                continue
+            self.rate, self.channels = rate, channels
+            break
+        else:
+            print(f"Error finding a recording format: {device['name']} supports none of "
+                  f"{', '.join(f'{rate} Hz x{channels}' for rate, channels in candidates)}")
+            self.capture_path = None
+            return None
+
+        if self.rate == self.MODEL_RATE:
+            self.capture_path = "native"
+        elif self.rate % self.MODEL_RATE == 0:
+            self.capture_path = "integer-ratio"
+        else:
+            self.capture_path = "polyphase"
+        print(f"Capturing at {self.rate} Hz, {self.channels} channel(s): {self.capture_path} path")
+        return self.capture_path
 
     def start_recording(self):
-        """Start audio recording."""
-        self.frames = []
-        self.is_recording = True
+        """
+        Start audio recording.
 
+        Raises:
+            OSError: If there is no microphone, or it cannot record in a usable format.
+        """
+        if self.capture_path is None and self.negotiate_capture_format() is None:
+            raise OSError("No microphone was found that can record in a supported format")
         self.stream = self.p.open(format=self.format,
                                   channels=self.channels,
                                   rate=self.rate,
                                   input=True,
                                   frames_per_buffer=self.chunk)
+        self.frames = Recording()
+        self.is_recording = True
+
+        self.vad.reset()
 
         def record():
+            heard_speech = False
+            silence = 0.0
             while self.is_recording:
                 data = self.stream.read(self.chunk)
                 self.frames.append(data)
+                if not self.auto_stop_silence:
+                    continue
+                if self.vad.is_speech(self.to_mono([data])):
+                    heard_speech, silence = True, 0.0
+                elif heard_speech:
+                    silence += self.chunk / self.rate
+                    if silence >= self.auto_stop_silence:
+                        self.is_recording = False
+                        print("Recording stopped after silence")
+                        if self.on_stop_callback:
+                            self.on_stop_callback()
 
-        Thread(target=record).start()
+        self.record_thread = Thread(target=record)
+        self.record_thread.start()
+        if self.streaming:
+            self.transcriber = self.frames.transcriber = StreamingTranscriber(vad=self.vad)
+            self.stream_thread = Thread(target=self.stream_transcription, args=(self.frames, self.record_thread), daemon=True)
+            self.frames.stream_thread = self.stream_thread
+            self.stream_thread.start()
         print("Recording started...")
 
+    def stream_transcription(self, frames, record_thread):
+        """
+        Feed new audio to the streaming transcriber while the recording is running.
+
+        Runs on its own thread so that model inference never delays the capture loop.
+        New audio is resampled with a StreamResampler, so slice boundaries leave no
+        filter artifacts in what the model hears.
+
+        Args:
+            frames (Recording): The recording the capture thread is appending to.
+            record_thread (Thread): The capture thread filling frames.
+        """
+        transcriber = frames.transcriber
+        resampler = StreamResampler(self.rate, self.MODEL_RATE)
+        consumed = 0
+        while True:
+            recording = record_thread.is_alive()
+            available = len(frames)
+            if available > consumed:
+                transcriber.add_audio(resampler.process(self.to_mono(frames[consumed:available])))
+                consumed = available
+                if recording:
+                    transcriber.process_available()
+            if not recording:
+                transcriber.add_audio(resampler.flush())
+                break
+            time.sleep(0.1)
+
+    def get_partial_transcription(self):
+        """
+        Get the running transcription of the current recording in streaming mode.
+
+        Returns:
+            str: The phoneme hypothesis so far, or an empty string when not streaming.
+        """
+        if self.transcriber is None:
+            return ""
+        return self.transcriber.get_hypothesis()
+
     def stop_recording(self):
         """
         Stop audio recording and process the recorded audio.
@@ -84,35 +239,137 @@ class Audio:
         Returns:
             str: The transcription of the recorded audio.
         """
+        self.finish_recording()
+        transcription = self.process_recording()[0]
+        return transcription 
+
+    def finish_recording(self):
+        """
+        Stop audio recording without transcribing it.
+
+        This is the fast part of stop_recording and is safe to call on the UI thread;
+        process_recording can then be run in the background.
+
+        Returns:
+            list: The raw frames captured during this recording.
+        """
         self.is_recording = False
+        if self.record_thread is not None:
+            self.record_thread.join()
         self.stream.stop_stream()
         self.stream.close()
 
-        wf = wave.open(self.output_filename, 'wb')
+        frames = self.frames
+        if self.archive:
+            self.save_recording(frames)
+        print("Recording stopped")
+        return frames
+
+    def save_recording(self, frames=None, filename=None):
+        """
+        Archive a recording to a WAV file.
+
+        Args:
+            frames (list, optional): Raw frames to save. Defaults to the last recording.
+            filename (str, optional): Path of the WAV file. Defaults to output_filename.
+        """
+        frames = self.frames if frames is None else frames
+        filename = filename or self.output_filename
+        wf = wave.open(filename, 'wb')
         wf.setnchannels(self.channels)
         wf.setsampwidth(self.p.get_sample_size(self.format))
         wf.setframerate(self.rate)
-        wf.writeframes(b''.join(self.frames))
+        wf.writeframes(b''.join(frames))
         wf.close()
-        print("Recording stopped and saved to", self.output_filename)
+        print("Recording saved to", filename)
 
-        transcription = self.process_recording()
-        return transcription 
+    def get_audio_buffer(self, frames=None):
+        """
+        Convert captured frames into model input without touching the disk.
+
+        The int16 frames are viewed as a NumPy array, downmixed to mono, scaled to
+        [-1, 1) and, unless they were captured natively, resampled to the model's
+        16 kHz rate.
 
-    def process_recording(self):
+        Args:
+            frames (list, optional): Raw frames to convert. Defaults to the last recording.
+
+        Returns:
+            numpy.ndarray: Mono float32 samples at 16 kHz.
         """
-        Process the recorded audio file and generate a transcription.
+        frames = self.frames if frames is None else frames
+        return self.resample(self.to_mono(frames), self.rate)
+
+    def to_mono(self, frames):
+        """
+        View captured int16 frames as mono float samples at the capture rate.
+
+        Args:
+            frames (list): Raw frames as read from the stream.
 
         Returns:
-            str: The transcription of the audio.
+            numpy.ndarray: Mono float32 samples in [-1, 1).
         """
-        audio, rate = librosa.load(self.output_filename, sr=16000)
-        input_values = self.processor(audio, return_tensors="pt", sampling_rate=16000).input_values
-        logits = self.model(input_values).logits
-        predicted_ids = torch.argmax(logits, dim=-1)
-        transcription = self.processor.decode(predicted_ids[0])
+        samples = np.frombuffer(b''.join(frames), dtype=np.int16)
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1)
+        return samples.astype(np.float32) / 32768.0
+
+    @classmethod
+    def resample(cls, audio, rate):
+        """
+        Resample audio to the model rate with a polyphase filter.
+
+        Args:
+            audio (numpy.ndarray): Mono float32 samples.
+            rate (int): Sample rate of the audio.
+
+        Returns:
+            numpy.ndarray: The samples at 16 kHz.
+        """
+        if rate == cls.MODEL_RATE:
+            return audio
+        from scipy.signal import resample_poly
+
+        divisor = gcd(rate, cls.MODEL_RATE)
+        up, down = cls.MODEL_RATE // divisor, rate // divisor
+        return resample_poly(audio, up, down).astype(np.float32)
+
+    def process_recording(self, frames=None):
+        """
+        Process a recording and generate a transcription.
+
+        Leading and trailing silence is left out of inference. A recording made in
+        streaming mode has mostly been transcribed already by its own transcriber, so
+        only its last window is run through the model here. Results are returned
+        rather than kept on the recorder, so transcriptions of several recordings can
+        run at once.
+
+        Args:
+            frames (list, optional): Raw frames to transcribe. Defaults to the last recording.
+
+        Returns:
+            tuple: The transcription of the audio, the seconds spent speaking, the
+            model's logits, and the time in the recording of their first frame.
+        """
+        frames = self.frames if frames is None else frames
+        transcriber = getattr(frames, "transcriber", None)
+        if transcriber is not None:
+            # Wait for the recording's own stream thread to hand over its last audio
+            frames.stream_thread.join()
+            transcription = transcriber.finish()
+            speech_duration = self.vad.speech_duration(transcriber.get_audio())
+            return transcription, speech_duration, transcriber.get_logits(), 0.0
+
+        audio = self.get_audio_buffer(frames)
+        speech_duration = self.vad.speech_duration(audio)
+        bounds = self.vad.find_speech(audio)
+        logits_offset = 0.0 if bounds is None else max(0, bounds[0] - self.vad.padding) / self.MODEL_RATE
+        audio = self.vad.trim(audio)
+        logits = BatchTranscriber.logits(audio, label="recording")
+        transcription = self.processor.decode(logits.argmax(dim=-1))
 
-        return transcription
+        return transcription, speech_duration, logits.numpy(), logits_offset
 
     def expected_phonemes(self, expected_text):
         """
@@ -124,23 +381,37 @@ class Audio:
         Returns:
             str: The phoneme representation of the expected text.
         """
-        expected_phonemes = phonemize(expected_text, language='en-us', backend='espeak', strip=True, preserve_punctuation=False, with_stress=False)
+        expected_phonemes = PhonemizerService.phonemize(expected_text, language='en-us')
         return expected_phonemes
 
-    def improved_compare_phonemes(self, expected_text, recorded_phonemes):
+    def improved_compare_phonemes(self, expected_text, recorded_phonemes, expected_phonemes=None, logits=None, offset=0.0):
         """
-        Compare the expected text with the recorded phonemes.
+        Compare the expected text with the recorded phonemes using the scoring strategy.
 
         Args:
             expected_text (str): The expected text.
             recorded_phonemes (str): The phonemes from the recorded audio.
+            expected_phonemes (str, optional): Precomputed phonemes of the expected text.
+            logits (array, optional): The recording's CTC logits, for frame-level strategies.
+            offset (float): Time in the recording of the first logits frame, in seconds.
 
         Returns:
-            list: A list of tuples containing words and their similarity scores.
+            tuple: A list of tuples containing words and their similarity scores, the
+            timing of each word in the recording (None unless the strategy times
+            words), and the per-word results of build_feedback.
         """
-        word_scores = improved_phoneme_comparison(expected_text, recorded_phonemes)
-        feedback= provide_feedback(word_scores, expected_text, threshold=0.6)
-        return word_scores
+        word_scores, alignments = self.scoring.score_with_alignments(
+            expected_text, recorded_phonemes, expected_phonemes, logits
+        )
+        word_alignments = None
+        if alignments is not None:
+            word_alignments = [
+                {**alignment, "start": alignment["start"] + offset, "end": alignment["end"] + offset}
+                if alignment["start"] is not None else alignment
+                for alignment in alignments
+            ]
+        feedback = build_feedback(word_scores, expected_text.split(), threshold=0.6)
+        return word_scores, word_alignments, feedback
 
     def highlight_incorrect_words(self, expected_text, discrepancies):
         """
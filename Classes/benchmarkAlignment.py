@@ -0,0 +1,142 @@
+import argparse
+import random
+import statistics
+import time
+from PhonemeAligner import PHONEME_SIMILARITY, ReferencePhonemeAligner
+from StoryDatabaseManager import StoryDatabaseManager
+from precomputeStoryPhonemes import phonemize_story
+from speechTest import difflib_phoneme_comparison, improved_phoneme_comparison
+
+_reference_aligner = ReferencePhonemeAligner()
+
+
+def reference_phoneme_comparison(expected_text, recorded_phonemes, expected_phonemes):
+    """Score words with the pure-Python aligner the vectorized one must agree with."""
+    return _reference_aligner.word_scores(expected_text.split(), expected_phonemes.split(), "".join(recorded_phonemes.split()))
+
+
+SCORERS = {
+    "difflib": difflib_phoneme_comparison,
+    "edit distance (Python)": reference_phoneme_comparison,
+    "edit distance (NumPy)": improved_phoneme_comparison,
+}
+
+
+def similar_phoneme(phoneme):
+    """Get a phoneme that PHONEME_SIMILARITY treats as close to this one, or the phoneme itself."""
+    for a, b in PHONEME_SIMILARITY:
+        if phoneme == a:
+            return b
+        if phoneme == b:
+            return a
+    return phoneme
+
+
+def build_corpus(num_stories, error_rate, seed):
+    """
+    Simulate readings of story sentences with known mistakes.
+
+    Each word is misread (replaced by another word's phonemes), skipped, or read
+    correctly with its phonemes nudged to similar ones, so every reading comes
+    with the set of words a good scorer should flag.
+
+    Args:
+        num_stories (int): Number of stories from tinystories.db to use.
+        error_rate (float): Chance that a word is misread or skipped.
+        seed (int): Random seed, so runs are comparable.
+
+    Returns:
+        list: (sentence, expected phonemes, recorded phonemes, indexes of misread words) tuples.
+    """
+    story_db = StoryDatabaseManager()
+    stories = story_db.get_all_story_bodies()[:num_stories]
+    story_db.close_connection()
+
+    rng = random.Random(seed)
+    sentences = [sentence for _, body in stories for sentence in phonemize_story(body or "")]
+    vocabulary = [phonemes for _, _, words in sentences for _, phonemes in words if phonemes]
+
+    corpus = []
+    for sentence, phonemes, words in sentences:
+        recorded = []
+        misread = set()
+        for index, (_, word_phonemes) in enumerate(words):
+            roll = rng.random()
+            if roll < error_rate / 2:
+                misread.add(index)
+            elif roll < error_rate:
+                misread.add(index)
+                recorded.append(rng.choice([other for other in vocabulary if other != word_phonemes] or ["x"]))
+            else:
+                recorded.append("".join(
+                    similar_phoneme(phoneme) if rng.random() < 0.1 else phoneme for phoneme in word_phonemes
+                ))
+        corpus.append((sentence, phonemes, " ".join(recorded), misread))
+    return corpus
+
+
+def evaluate(scorer, corpus, threshold):
+    """
+    Time a scorer over the corpus and compare the words it flags with the known mistakes.
+
+    Args:
+        scorer (function): Called as scorer(expected_text, recorded_phonemes, expected_phonemes).
+        corpus (list): Output of build_corpus.
+        threshold (float): Scores below this flag a word as misread.
+
+    Returns:
+        dict: Latency per sentence in milliseconds, precision, recall, word accuracy and
+        the scores themselves.
+    """
+    latencies = []
+    all_scores = []
+    true_positives = false_positives = false_negatives = correct = total = 0
+    for sentence, phonemes, recorded, misread in corpus:
+        start = time.perf_counter()
+        word_scores = scorer(sentence, recorded, phonemes)
+        latencies.append((time.perf_counter() - start) * 1000)
+        all_scores.extend(score for _, score in word_scores)
+
+        flagged = {index for index, (_, score) in enumerate(word_scores) if score < threshold}
+        true_positives += len(flagged & misread)
+        false_positives += len(flagged - misread)
+        false_negatives += len(misread - flagged)
+        total += len(word_scores)
+        correct += sum((index in flagged) == (index in misread) for index in range(len(word_scores)))
+
+    return {
+        "mean_ms": statistics.mean(latencies),
+        "max_ms": max(latencies),
+        "precision": true_positives / max(1, true_positives + false_positives),
+        "recall": true_positives / max(1, true_positives + false_negatives),
+        "accuracy": correct / max(1, total),
+        "scores": all_scores,
+    }
+
+
+def main():
+    """Compare the speed and accuracy of the word scorers on simulated readings."""
+    parser = argparse.ArgumentParser(description="Benchmark the word alignment and scoring methods.")
+    parser.add_argument("--stories", type=int, default=10, help="Number of stories to build readings from")
+    parser.add_argument("--error-rate", type=float, default=0.2, help="Chance that a word is misread or skipped")
+    parser.add_argument("--threshold", type=float, default=0.6, help="Score below which a word counts as misread")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.stories, args.error_rate, args.seed)
+    print(f"{len(corpus)} simulated readings from {args.stories} stories\n")
+    print(f"{'Scorer':<24}{'Mean (ms)':>11}{'Max (ms)':>10}{'Precision':>11}{'Recall':>9}{'Accuracy':>10}")
+    results = {}
+    for name, scorer in SCORERS.items():
+        result = results[name] = evaluate(scorer, corpus, args.threshold)
+        print(f"{name:<24}{result['mean_ms']:>11.3f}{result['max_ms']:>10.3f}"
+              f"{result['precision']:>11.1%}{result['recall']:>9.1%}{result['accuracy']:>10.1%}")
+
+    # The vectorized aligner must give the same scores as the pure-Python one
+    drift = max((abs(a - b) for a, b in zip(results["edit distance (Python)"]["scores"],
+                                             results["edit distance (NumPy)"]["scores"])), default=0.0)
+    print(f"\nLargest score difference between the Python and NumPy aligners: {drift:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import statistics
+import time
+from pathlib import Path
+import librosa
+import Levenshtein
+import torch
+from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
+from InferenceBackend import BACKENDS, model_memory
+from ModelRegistry import ModelRegistry
+
+
+def load_recordings(folder):
+    """
+    Load every WAV file in a folder at the model's 16 kHz rate.
+
+    Args:
+        folder (str): Folder containing the fixed set of recordings.
+
+    Returns:
+        list: (name, samples) pairs sorted by file name.
+    """
+    recordings = []
+    for path in sorted(Path(folder).glob("*.wav")):
+        audio, _ = librosa.load(path, sr=16000)
+        recordings.append((path.name, audio))
+    return recordings
+
+
+def phoneme_error_rate(reference, hypothesis):
+    """
+    Calculate the phoneme error rate of a transcription against a reference one.
+
+    Args:
+        reference (str): Space separated reference phonemes.
+        hypothesis (str): Space separated phonemes to check.
+
+    Returns:
+        float: Edit distance divided by the reference length.
+    """
+    reference_phonemes = reference.split()
+    if not reference_phonemes:
+        return 0.0 if not hypothesis.split() else 1.0
+    return Levenshtein.distance(reference_phonemes, hypothesis.split()) / len(reference_phonemes)
+
+
+def benchmark_backend(name, processor, recordings, repeats, num_threads):
+    """
+    Measure latency, memory and transcriptions for one backend.
+
+    Args:
+        name (str): Backend name from InferenceBackend.BACKENDS.
+        processor (Wav2Vec2Processor): Shared processor.
+        recordings (list): (name, samples) pairs.
+        repeats (int): Timed runs per recording.
+        num_threads (int): Intra-op thread count, None for PyTorch's default.
+
+    Returns:
+        dict: Latency statistics, model memory, resident memory growth from loading
+        the model and from running it, and the transcription of each recording.
+    """
+    # Read before the model loads, so the growth includes its weights
+    rss_before = ModelRegistry.get_resident_memory()
+    backend = BACKENDS[name](num_threads=num_threads)
+    model = backend.prepare(Wav2Vec2ForCTC.from_pretrained(ModelRegistry.MODEL_NAME))
+    rss_loaded = ModelRegistry.get_resident_memory()
+
+    latencies = []
+    transcriptions = {}
+    for recording_name, audio in recordings:
+        input_values = processor(audio, return_tensors="pt", sampling_rate=16000).input_values
+        backend.run(model, input_values)  # Untimed warm-up run
+        for _ in range(repeats):
+            start = time.perf_counter()
+            logits = backend.run(model, input_values)
+            latencies.append(time.perf_counter() - start)
+        predicted_ids = torch.argmax(logits, dim=-1)
+        transcriptions[recording_name] = processor.decode(predicted_ids[0])
+
+    rss_after = ModelRegistry.get_resident_memory()
+    return {
+        "backend": backend.describe(),
+        "mean_latency": statistics.mean(latencies),
+        "median_latency": statistics.median(latencies),
+        "model_memory": model_memory(model),
+        "rss_load_growth": None if rss_before is None else rss_loaded - rss_before,
+        "rss_inference_growth": None if rss_before is None else rss_after - rss_loaded,
+        "transcriptions": transcriptions,
+    }
+
+
+def main():
+    """Compare each inference backend against the fp32 reference."""
+    parser = argparse.ArgumentParser(description="Benchmark the phoneme recognizer's inference backends.")
+    parser.add_argument("recordings", help="Folder of WAV recordings to transcribe")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per recording")
+    parser.add_argument("--threads", type=int, default=None, help="Intra-op thread count")
+    args = parser.parse_args()
+
+    recordings = load_recordings(args.recordings)
+    if not recordings:
+        print(f"No WAV files found in {args.recordings}")
+        return
+
+    processor = Wav2Vec2Processor.from_pretrained(ModelRegistry.MODEL_NAME)
+    names = ["fp32"] + [name for name in args.backends if name != "fp32"]
+    results = {name: benchmark_backend(name, processor, recordings, args.repeats, args.threads) for name in names}
+    reference = results["fp32"]["transcriptions"]
+
+    print(f"{len(recordings)} recordings, {args.repeats} timed runs each\n")
+    print(f"{'Backend':<36}{'Mean (s)':>10}{'Median (s)':>12}{'Weights (MB)':>14}{'PER vs fp32':>13}")
+    for name, result in results.items():
+        drift = statistics.mean(
+            phoneme_error_rate(reference[recording], result["transcriptions"][recording])
+            for recording in reference
+        )
+        print(f"{result['backend']:<36}{result['mean_latency']:>10.3f}{result['median_latency']:>12.3f}"
+              f"{result['model_memory'] / 2**20:>14.1f}{drift:>13.2%}")
+        if result["rss_load_growth"] is not None:
+            print(f"{'':<36}resident memory grew by {result['rss_load_growth'] / 2**20:.1f} MB loading the model "
+                  f"and {result['rss_inference_growth'] / 2**20:.1f} MB more running it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import time
+from phonemizer import phonemize
+from PhonemizerService import PhonemizerService
+from StoryDatabaseManager import StoryDatabaseManager
+from story import split_sentences
+
+
+def load_corpus(num_stories):
+    """
+    Collect the sentences and words of the first stories in tinystories.db.
+
+    Args:
+        num_stories (int): Number of stories to take.
+
+    Returns:
+        tuple: (sentences, words) lists, in reading order.
+    """
+    story_db = StoryDatabaseManager()
+    stories = story_db.get_all_story_bodies()[:num_stories]
+    story_db.close_connection()
+
+    sentences = [sentence for _, body in stories for sentence in split_sentences(body or "")]
+    words = [word for sentence in sentences for word in sentence.split()]
+    return sentences, words
+
+
+def time_run(function, texts):
+    """
+    Time one phonemization strategy over a list of texts.
+
+    Args:
+        function (function): Called with the full list of texts.
+        texts (list): Texts to phonemize.
+
+    Returns:
+        tuple: (seconds, results).
+    """
+    start = time.perf_counter()
+    results = function(texts)
+    return time.perf_counter() - start, results
+
+
+def per_call_fresh(texts):
+    """The old path: phonemizer.phonemize per text, which builds a new espeak backend each time."""
+    return [phonemize(text, language="en-us", **PhonemizerService.DEFAULT_OPTIONS) for text in texts]
+
+
+def per_call_persistent(texts):
+    """One call per text into PhonemizerService's long-lived backend, caches bypassed."""
+    return [PhonemizerService.phonemize_many([text], cache=False)[0] for text in texts]
+
+
+def batched_persistent(texts):
+    """Every text in a single batch through the long-lived backend, caches bypassed."""
+    return PhonemizerService.phonemize_many(texts, cache=False)
+
+
+STRATEGIES = {
+    "per-call (new backend)": per_call_fresh,
+    "per-call (persistent)": per_call_persistent,
+    "batched (persistent)": batched_persistent,
+}
+
+
+def main():
+    """Compare per-call and batched phonemization throughput on story text."""
+    parser = argparse.ArgumentParser(description="Benchmark per-call against batched espeak phonemization.")
+    parser.add_argument("--stories", type=int, default=5, help="Number of stories to phonemize")
+    args = parser.parse_args()
+
+    sentences, words = load_corpus(args.stories)
+    PhonemizerService.phonemize_many(["warm up"], cache=False)  # Keep backend start-up out of the timings
+
+    for corpus_name, texts in (("sentences", sentences), ("words", words)):
+        print(f"\n{len(texts)} {corpus_name} from {args.stories} stories")
+        print(f"{'Strategy':<26}{'Total (s)':>11}{'Texts/s':>11}{'Matches':>10}")
+        reference = None
+        for name, function in STRATEGIES.items():
+            seconds, results = time_run(function, texts)
+            reference = reference or results
+            matches = sum(a == b for a, b in zip(reference, results)) / max(1, len(texts))
+            print(f"{name:<26}{seconds:>11.3f}{len(texts) / seconds:>11.1f}{matches:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import argparse
+import csv
+import statistics
+import time
+import tracemalloc
+from itertools import combinations
+from pathlib import Path
+from PhonemizerService import PhonemizerService
+from ScoringStrategy import STRATEGIES
+from benchmarkAlignment import build_corpus
+
+# Strategies that score over the model's logits. Without recordings they would only
+# run their phoneme-string fallback, so they are reported as not measured instead.
+FRAME_LEVEL_STRATEGIES = ("dtw", "forced-alignment")
+
+
+def load_corpus(path):
+    """
+    Load (expected text, recorded phonemes) pairs from a tab-separated file.
+
+    Args:
+        path (str): File with the expected text and the recorded phonemes on each line.
+
+    Returns:
+        list: (expected text, expected phonemes, recorded phonemes, None) tuples.
+    """
+    with open(path, newline="", encoding="utf-8") as corpus_file:
+        pairs = [row[:2] for row in csv.reader(corpus_file, delimiter="\t") if len(row) >= 2]
+    expected_phonemes = PhonemizerService.phonemize_many([text for text, _ in pairs])
+    return [(text, phonemes, recorded, None) for (text, recorded), phonemes in zip(pairs, expected_phonemes)]
+
+
+def load_recordings(folder):
+    """
+    Transcribe a folder of recordings once, keeping the model's logits for each.
+
+    Every WAV file needs a .txt file with the same name holding the sentence that
+    was read. Silence is trimmed as in a reading session before the recording is
+    run through the shared model.
+
+    Args:
+        folder (str): Folder of WAV recordings and their sentences.
+
+    Returns:
+        list: (expected text, expected phonemes, recorded phonemes, logits) tuples.
+    """
+    # The speech libraries are only needed for recordings
+    import librosa
+    from BatchTranscriber import BatchTranscriber
+    from ModelRegistry import ModelRegistry
+    from VoiceActivityDetector import VoiceActivityDetector
+
+    vad = VoiceActivityDetector()
+    texts, recordings = [], []
+    for path in sorted(Path(folder).glob("*.wav")):
+        text_path = path.with_suffix(".txt")
+        if not text_path.exists():
+            print(f"Skipping {path.name}: no {text_path.name} with the sentence read")
+            continue
+        texts.append(text_path.read_text(encoding="utf-8").strip())
+        audio, _ = librosa.load(path, sr=16000)
+        logits = BatchTranscriber.logits(vad.trim(audio), label="benchmark")
+        recorded = ModelRegistry.get_processor().decode(logits.argmax(dim=-1))
+        recordings.append((recorded, logits.numpy()))
+    expected_phonemes = PhonemizerService.phonemize_many(texts)
+    return [
+        (text, phonemes, recorded, logits)
+        for text, phonemes, (recorded, logits) in zip(texts, expected_phonemes, recordings)
+    ]
+
+
+def run_strategy(strategy, corpus):
+    """
+    Score every sentence of the corpus with one strategy.
+
+    Latency is timed on a plain run; peak memory is measured on a second run
+    under tracemalloc, which would otherwise slow the timed one down.
+
+    Args:
+        strategy (ScoringStrategy): The strategy to run.
+        corpus (list): (expected text, expected phonemes, recorded phonemes, logits) tuples.
+
+    Returns:
+        dict: Latencies per sentence in milliseconds, peak traced memory in bytes and
+        the word scores of each sentence.
+    """
+    latencies = []
+    scores = []
+    for text, phonemes, recorded, logits in corpus:
+        start = time.perf_counter()
+        scores.append([score for _, score in strategy.score(text, recorded, phonemes, logits)])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    for text, phonemes, recorded, logits in corpus:
+        strategy.score(text, recorded, phonemes, logits)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"latencies": latencies, "peak_memory": peak, "scores": scores}
+
+
+def agreement(first, second, threshold):
+    """
+    Compare two strategies' word scores.
+
+    Args:
+        first (list): Word scores of each sentence from one strategy.
+        second (list): Word scores of each sentence from another.
+        threshold (float): Scores below this flag a word as misread.
+
+    Returns:
+        tuple: Fraction of words both flag the same way, and mean absolute score difference.
+    """
+    pairs = [(a, b) for sentence_a, sentence_b in zip(first, second) for a, b in zip(sentence_a, sentence_b)]
+    if not pairs:
+        return 1.0, 0.0
+    same = sum((a < threshold) == (b < threshold) for a, b in pairs) / len(pairs)
+    return same, statistics.mean(abs(a - b) for a, b in pairs)
+
+
+def main():
+    """Run every scoring strategy over a corpus and report speed, memory and agreement."""
+    parser = argparse.ArgumentParser(description="Benchmark the word scoring strategies.")
+    parser.add_argument("--corpus", help="Tab-separated file of expected text and recorded phonemes. "
+                                         "Simulated readings of the stories are used if not given")
+    parser.add_argument("--recordings", help="Folder of WAV recordings, each with a .txt file of the sentence read. "
+                                             "Needed to measure the strategies that use the model's logits")
+    parser.add_argument("--stories", type=int, default=10, help="Stories to simulate readings from")
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES), choices=list(STRATEGIES))
+    parser.add_argument("--threshold", type=float, default=0.6, help="Score below which a word counts as misread")
+    args = parser.parse_args()
+
+    if args.recordings:
+        corpus = load_recordings(args.recordings)
+    elif args.corpus:
+        corpus = load_corpus(args.corpus)
+    else:
+        corpus = [(text, phonemes, recorded, None) for text, phonemes, recorded, _ in build_corpus(args.stories, 0.2, 0)]
+    if not corpus:
+        print("The corpus is empty")
+        return
+
+    has_logits = all(logits is not None for *_, logits in corpus)
+    measured = [name for name in args.strategies if has_logits or name not in FRAME_LEVEL_STRATEGIES]
+    results = {name: run_strategy(STRATEGIES[name](), corpus) for name in measured}
+
+    print(f"{len(corpus)} sentences{'' if has_logits else ' without logits'}\n")
+    print(f"{'Strategy':<18}{'Mean (ms)':>11}{'Median (ms)':>13}{'Max (ms)':>10}{'Peak memory (KB)':>18}")
+    for name in args.strategies:
+        if name not in results:
+            print(f"{name:<18}not measured, pass --recordings to run it over the model's logits")
+            continue
+        result = results[name]
+        latencies = result["latencies"]
+        print(f"{name:<18}{statistics.mean(latencies):>11.3f}{statistics.median(latencies):>13.3f}"
+              f"{max(latencies):>10.3f}{result['peak_memory'] / 1024:>18.1f}")
+
+    print(f"\n{'Agreement':<34}{'Same verdict':>14}{'Mean |diff|':>13}")
+    for first, second in combinations(results, 2):
+        same, difference = agreement(results[first]["scores"], results[second]["scores"], args.threshold)
+        print(f"{first + ' vs ' + second:<34}{same:>14.1%}{difference:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import argparse
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from DatabaseManager import AGGREGATED_STATS, ALL_STATS, PASSWORD_BY_EMAIL, STATS_PAGE, USER_IMPROVEMENT, USER_STATS
+from DatabaseMigrations import MIGRATIONS, migrate
+from StoryDatabaseManager import STORIES_BY_DIFFICULTY
+
+# (name, database file, query, example parameters, index it must use as shown in the plan)
+HOT_QUERIES = [
+    ("Student login", "READ_Database.db", PASSWORD_BY_EMAIL["Student"], ("student@example.com",), "INDEX sqlite_autoindex_Students_2"),
+    ("Admin login", "READ_Database.db", PASSWORD_BY_EMAIL["Admin"], ("admin@example.com",), "INDEX sqlite_autoindex_Admin_1"),
+    ("fetch_all_stats", "READ_Database.db", ALL_STATS, (), "INDEX idx_stats_date_id"),
+    # fetch_stats_page: the first page, a later page, the undated rows and a date range.
+    # Filtering by StudentID prefix is left to the planner, which may seek
+    # idx_stats_student_nocase and sort the matches.
+    ("fetch_stats_page first", "READ_Database.db", STATS_PAGE.format(conditions="Date IS NOT NULL"),
+     (100,), "INDEX idx_stats_date_id"),
+    ("fetch_stats_page next", "READ_Database.db", STATS_PAGE.format(conditions="Date IS NOT NULL AND (Date, ID) < (?, ?)"),
+     ("2024-09-01", 500, 100), "INDEX idx_stats_date_id"),
+    ("fetch_stats_page undated", "READ_Database.db", STATS_PAGE.format(conditions="Date IS NULL AND ID < ?"),
+     (500, 100), "INDEX idx_stats_date_id"),
+    ("fetch_stats_page dates", "READ_Database.db",
+     STATS_PAGE.format(conditions="Date >= ? AND Date <= ? AND Date IS NOT NULL AND (Date, ID) < (?, ?)"),
+     ("2024-08-01", "2024-08-31", "2024-08-20", 500, 100), "INDEX idx_stats_date_id"),
+    ("fetch_aggregated_stats", "READ_Database.db", AGGREGATED_STATS, (), "INTEGER PRIMARY KEY"),
+    ("fetch_user_stats", "READ_Database.db", USER_STATS, ("ABC12345",), "PRIMARY KEY"),
+    ("fetch_user_improvement", "READ_Database.db", USER_IMPROVEMENT, ("ABC12345", "2024-01-01", "2024-12-31"), "PRIMARY KEY"),
+    ("get_story_excerpts_by_reading_level", "tinystories.db", STORIES_BY_DIFFICULTY, ("Easy", 3), "INDEX idx_stories_difficulty"),
+]
+
+
+def explain(connection, query, params):
+    """
+    Get SQLite's plan for a query.
+
+    Returns:
+        list: The detail line of each step of the plan.
+    """
+    return [row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+
+def check_plan(plan, index):
+    """
+    Check that a plan reads through the expected index and never scans a table or sorts.
+
+    Args:
+        plan (list): Detail lines from explain().
+        index (str): The index the query must use, as it appears in the plan.
+
+    Returns:
+        list: A message for each problem found.
+    """
+    problems = []
+    for step in plan:
+        if step.startswith("SCAN") and "USING" not in step:
+            problems.append(f"full table scan ({step})")
+        if "TEMP B-TREE" in step:
+            problems.append(f"sorts its results ({step})")
+    if not any(index in step for step in plan):
+        problems.append(f"does not use {index}")
+    return problems
+
+
+def open_databases(folder, live):
+    """
+    Open a connection to each database the hot queries run on.
+
+    Args:
+        folder (Path): Where to create empty databases with the current schema.
+        live (bool): Check the real databases in the Database folder instead.
+
+    Returns:
+        dict: Connection per database file name.
+    """
+    connections = {}
+    for name, migrations in MIGRATIONS.items():
+        if live:
+            from ConnectionManager import DATABASE_FOLDER, ConnectionManager
+            connections[name] = ConnectionManager.get_connection(DATABASE_FOLDER / name)
+        else:
+            connections[name] = sqlite3.connect(Path(folder) / name)
+            migrate(connections[name], migrations)
+    return connections
+
+
+def main():
+    """Fail if any hot query would scan a table instead of using its index."""
+    parser = argparse.ArgumentParser(description="Check that the hot queries are answered from an index.")
+    parser.add_argument("--live", action="store_true", help="Check the databases in the Database folder instead of fresh ones")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as folder:
+        connections = open_databases(folder, args.live)
+        for name, database, query, params, index in HOT_QUERIES:
+            plan = explain(connections[database], query, params)
+            problems = check_plan(plan, index)
+            print(f"{'FAIL' if problems else 'ok':<6}{name}: {'; '.join(plan)}")
+            failures.extend(f"{name} {problem}" for problem in problems)
+        if not args.live:
+            for connection in connections.values():
+                connection.close()
+
+    if failures:
+        print("\nQuery plan check failed:")
+        for failure in failures:
+            print(f"- {failure}")
+        sys.exit(1)
+    print(f"\nAll {len(HOT_QUERIES)} hot queries use their index")
+
+
+if __name__ == "__main__":
+    main()
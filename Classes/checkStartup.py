@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from profileImports import HEAVY_MODULES, print_report, profile_import
+
+# Longest each screen's module may take to import in a fresh interpreter, in seconds
+IMPORT_BUDGETS = {
+    "Login": 0.5,
+    "SignUp": 0.5,
+    "StudentHomePage": 0.5,
+    "SelectStory": 0.5,
+    "ChooseStory": 0.5,
+    "ReadingSession": 0.75,
+    "Feedback": 0.75,
+    "FinalFeedback": 0.5,
+    "AdminHomePage": 0.75,
+}
+
+# Longest from starting Login.py to its window being drawn, in seconds
+PAINT_BUDGET = 1.0
+
+
+def measure_login_paint():
+    """
+    Time a cold start of Login.py up to its first drawn frame.
+
+    Returns:
+        tuple: Seconds from launch to exit, and None, or None and Login.py's error
+        output if it failed to start (including when no display is available).
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "Login.py"], cwd=Path(__file__).parent, capture_output=True, text=True,
+        env={**os.environ, "READ_STARTUP_PROBE": "1"},
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        return None, completed.stderr.strip() or f"exit status {completed.returncode}"
+    return elapsed, None
+
+
+def check(results, baseline=None, tolerance=0.2):
+    """
+    Compare import profiles with the budgets and an optional baseline.
+
+    Args:
+        results (dict): profile_import() result for each screen.
+        baseline (dict, optional): Earlier results that must not be exceeded by more than tolerance.
+        tolerance (float): Allowed fractional growth over the baseline.
+
+    Returns:
+        list: A message for each failed check.
+    """
+    failures = []
+    for module, result in results.items():
+        if result["error"]:
+            failures.append(f"{module} failed to import: {result['error']}")
+            continue
+        if result["heavy"]:
+            failures.append(f"{module} imports {', '.join(result['heavy'])} at startup")
+        if result["total"] > IMPORT_BUDGETS[module]:
+            failures.append(f"{module} took {result['total']:.3f}s to import, budget is {IMPORT_BUDGETS[module]:.3f}s")
+        before = (baseline or {}).get(module, {}).get("total")
+        # Small absolute slack so timer noise on fast imports doesn't fail the check
+        if before is not None and result["total"] > before * (1 + tolerance) + 0.02:
+            failures.append(f"{module} import time regressed from {before:.3f}s to {result['total']:.3f}s")
+    return failures
+
+
+def main():
+    """Fail if any screen's cold-start cost is over budget or has regressed."""
+    parser = argparse.ArgumentParser(description="Check each screen's cold-start import time against its budget.")
+    parser.add_argument("--baseline", help="JSON file from profileImports.py --save to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed growth over the baseline (default: 0.2)")
+    parser.add_argument("--skip-paint", action="store_true", help="Don't time Login's first frame, e.g. without a display")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    results = {module: profile_import(module) for module in IMPORT_BUDGETS}
+    print_report(results, baseline)
+    failures = check(results, baseline, args.tolerance)
+
+    if not args.skip_paint:
+        paint, error = measure_login_paint()
+        if error is not None:
+            print(f"\nCould not start Login.py:\n{error}")
+            failures.append("Login.py failed to start, see its error above (use --skip-paint without a display)")
+        else:
+            print(f"\nLogin drew its first frame {paint:.3f}s after launch (budget {PAINT_BUDGET:.3f}s)")
+            if paint > PAINT_BUDGET:
+                failures.append(f"Login took {paint:.3f}s to draw, budget is {PAINT_BUDGET:.3f}s")
+
+    if failures:
+        print("\nStartup check failed:")
+        for failure in failures:
+            print(f"- {failure}")
+        sys.exit(1)
+    print(f"\nAll screens are within their startup budget (heavy libraries checked: {', '.join(HEAVY_MODULES)})")
+
+
+if __name__ == "__main__":
+    main()
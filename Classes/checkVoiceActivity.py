@@ -0,0 +1,79 @@
+import sys
+import numpy as np
+from StreamingTranscriber import StreamingTranscriber
+from VoiceActivityDetector import VoiceActivityDetector
+
+RATE = VoiceActivityDetector.RATE
+
+
+def tone(seconds, level_db, frequency=200.0):
+    """A steady voiced tone at the given RMS level in dBFS."""
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (np.sqrt(2) * 10 ** (level_db / 20) * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def noise(seconds, level_db, seed=0):
+    """Background noise at the given RMS level in dBFS."""
+    return (np.random.default_rng(seed).standard_normal(int(seconds * RATE)) * 10 ** (level_db / 20)).astype(np.float32)
+
+
+def streaming_span(audio):
+    """The speech span a StreamingTranscriber would trim a recording to, see _speech_span."""
+    transcriber = StreamingTranscriber(vad=VoiceActivityDetector())
+    transcriber.add_audio(audio)
+    transcriber.get_audio()
+    return transcriber._speech_span()
+
+
+def check():
+    """
+    Run the voice activity checks.
+
+    Returns:
+        list: A message for each failed check.
+    """
+    vad = VoiceActivityDetector()
+    # A 2.5 s streaming window (2 s chunk plus context) read all the way through
+    voiced = tone(2.5, -20.0)
+    silent = noise(2.5, -70.0)
+    pause_then_speech = np.concatenate([noise(1.0, -60.0), tone(1.5, -20.0) + noise(1.5, -60.0, seed=1)])
+    # Room noise louder than the absolute minimum on both sides of the reading
+    noisy_room = np.concatenate([noise(3.0, -40.0), tone(3.0, -15.0) + noise(3.0, -40.0, seed=1), noise(3.0, -40.0, seed=2)])
+
+    failures = []
+    if not vad.has_sound(voiced):
+        failures.append("a fully voiced window would be skipped by the streaming transcriber")
+    if vad.has_sound(silent):
+        failures.append("a silent window would be run through the model")
+    if vad.find_speech(voiced) is None or vad.speech_duration(voiced) < 2.4:
+        failures.append("no speech found in a fully voiced recording")
+    if vad.find_speech(silent) is not None:
+        failures.append("speech found in a silent recording")
+    bounds = vad.find_speech(pause_then_speech)
+    if bounds is None or abs(bounds[0] / RATE - 1.0) > 0.05:
+        failures.append(f"speech after a pause found at {bounds}, expected to start at 1.0 s")
+
+    span = streaming_span(noisy_room)
+    if span is None or abs(span[0] / RATE - 2.8) > 0.05 or abs(span[1] / RATE - 6.2) > 0.05:
+        failures.append(f"streaming would transcribe {span} of a reading in a noisy room, expected 2.8 s to 6.2 s")
+    span = streaming_span(voiced)
+    if span is not None and (span[0] > 0 or span[1] < len(voiced)):
+        failures.append(f"streaming would skip part of a fully voiced recording, keeping only {span}")
+    if streaming_span(noise(2.5, -40.0)) is not None:
+        failures.append("streaming would commit steady room noise before any speech was heard")
+    return failures
+
+
+def main():
+    """Fail if voice activity detection drops speech or keeps silence."""
+    failures = check()
+    if failures:
+        print("Voice activity check failed:")
+        for failure in failures:
+            print(f"- {failure}")
+        sys.exit(1)
+    print("Voice activity detection keeps speech and skips silence")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
-import sqlite3
 from pathlib import Path
 import random, string
+from ConnectionManager import ConnectionManager
+from DatabaseMigrations import get_schema_version
 
 class DatabaseSetup:
     def __init__(self, db_folder: str = "Database", db_name: str = "READ_Database.db"):
@@ -10,62 +11,22 @@ class DatabaseSetup:
     def create_local_database(self):
         # Ensure the directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        existed = self.db_path.exists()
 
-        if not self.db_path.exists():
-            connection = sqlite3.connect(self.db_path)
-            cursor = connection.cursor()
+        # Opening the database through the pool creates any missing tables and
+        # applies the pending schema migrations, see DatabaseMigrations
+        connection = ConnectionManager.get_connection(self.db_path)
+        version = get_schema_version(connection)
 
-            # Create a table for students
-            cursor.execute(
-                '''CREATE TABLE Students (
-                    StudentID STRING PRIMARY KEY,
-                    Name TEXT, 
-                    Email TEXT UNIQUE, 
-                    Password TEXT, 
-                    Grade INTEGER,
-                    ReadingLevel TEXT
-                )'''
-            )
-            
-            # Create a table for admin
-            cursor.execute(
-                '''CREATE TABLE Admin (
-                    AdminID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    Name TEXT,
-                    Email TEXT UNIQUE,
-                    Password TEXT,
-                    AdminKey TEXT
-                )'''
-            )
-
-            # Create a table for session
-            cursor.execute(
-                '''CREATE TABLE Session (
-                    SessionID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    StudentID STRING,
-                    StoryID INTEGER,
-                    ReadingSpeed REAL,
-                    Accuracy REAL
-                )'''
-            )
-
-            # Create a table for stats
-            cursor.execute(
-                '''CREATE TABLE Stats (
-                    StudentID STRING,
-                    AvgReadingSpeed REAL,
-                    AvgAccuracy REAL
-                )'''
-            )
-
-            connection.commit()
-            connection.close()
-            print(f"Database created at {self.db_path}")
+        if not existed:
+            print(f"Database created at {self.db_path} (schema version {version})")
         else:
-            print(f"Database already exists at {self.db_path}")
+            print(f"Database at {self.db_path} is at schema version {version}")
         
 
 # Example usage:
 if __name__ == "__main__":
     db_setup = DatabaseSetup()
     db_setup.create_local_database()
+    DatabaseSetup(db_name="tinystories.db").create_local_database()
+    ConnectionManager.close_all()
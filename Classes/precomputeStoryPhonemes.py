@@ -0,0 +1,54 @@
+import argparse
+from StoryDatabaseManager import StoryDatabaseManager
+from PhonemizerService import PhonemizerService
+from story import split_sentences
+
+
+def phonemize_story(body):
+    """
+    Phonemize every sentence and word of a story the way a ReadingSession reads it.
+
+    Args:
+        body (str): The story body.
+
+    Returns:
+        list: (sentence, phonemes, [(word, word_phonemes), ...]) for each sentence.
+    """
+    sentences = split_sentences(body)
+    words = [sentence.split() for sentence in sentences]
+    # One espeak batch for the whole story: every sentence, then every word
+    phonemes = iter(PhonemizerService.phonemize_many(sentences + [word for line in words for word in line]))
+    sentence_phonemes = [next(phonemes) for _ in sentences]
+    return [
+        (sentence, phonemes_of_sentence, [(word, next(phonemes)) for word in line])
+        for sentence, phonemes_of_sentence, line in zip(sentences, sentence_phonemes, words)
+    ]
+
+
+def precompute(force=False):
+    """
+    Store phonemes for every story in tinystories.db that does not have current ones.
+
+    Args:
+        force (bool): Recompute stories that are already up to date.
+    """
+    story_db = StoryDatabaseManager()
+    version = PhonemizerService.version()
+
+    updated = 0
+    stories = story_db.get_all_story_bodies()
+    for story_id, body in stories:
+        if not force and story_db.get_phonemes_version(story_id) == version:
+            continue
+        story_db.save_story_phonemes(story_id, phonemize_story(body or ""), version)
+        updated += 1
+
+    print(f"Precomputed phonemes for {updated} of {len(stories)} stories ({version})")
+    story_db.close_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute phonemes for every story in tinystories.db.")
+    parser.add_argument("--force", action="store_true", help="Recompute stories that are already up to date")
+    args = parser.parse_args()
+    precompute(force=args.force)
@@ -0,0 +1,93 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Modules each screen is started from
+ENTRY_POINTS = [
+    "Login", "SignUp", "StudentHomePage", "SelectStory", "ChooseStory",
+    "ReadingSession", "Feedback", "FinalFeedback", "AdminHomePage",
+    "audio", "speechTest",
+]
+
+# Libraries that should only be imported once they are needed
+HEAVY_MODULES = ["torch", "transformers", "librosa", "phonemizer", "scipy", "fastdtw", "Levenshtein"]
+
+
+def profile_import(module):
+    """
+    Import a module in a fresh interpreter and measure it with -X importtime.
+
+    Args:
+        module (str): Name of the module to import, relative to this folder.
+
+    Returns:
+        dict: "total" cumulative import time in seconds, the cumulative "heavy" time of each
+        heavy library that was imported, and an "error" message if the import failed.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).parent, capture_output=True, text=True,
+    )
+
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times.setdefault(name.strip(), int(cumulative) / 1e6)
+
+    error = None
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "import failed"
+    return {
+        "total": None if error else times.get(module),
+        "heavy": {name: times[name] for name in HEAVY_MODULES if name in times},
+        "error": error,
+    }
+
+
+def print_report(results, baseline=None):
+    """
+    Print the import time of each entry point, compared with a baseline when given.
+
+    Args:
+        results (dict): profile_import() result for each module.
+        baseline (dict, optional): Earlier results to compare against.
+    """
+    print(f"{'Module':<18}{'Import (s)':>12}{'Before (s)':>12}  Heavy libraries imported")
+    for module, result in results.items():
+        before = (baseline or {}).get(module, {}).get("total")
+        total = "failed" if result["total"] is None else f"{result['total']:.3f}"
+        before = "" if before is None else f"{before:.3f}"
+        heavy = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in result["heavy"].items()) or "none"
+        print(f"{module:<18}{total:>12}{before:>12}  {heavy}")
+        if result["error"]:
+            print(f"{'':<18}{result['error']}")
+
+
+def main():
+    """Profile the import time of every UI entry point."""
+    parser = argparse.ArgumentParser(description="Profile how long each screen takes to import.")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS, help="Modules to profile")
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file from an earlier --save to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    results = {module: profile_import(module) for module in args.modules}
+    print_report(results, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as save_file:
+            json.dump(results, save_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
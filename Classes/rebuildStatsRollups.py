@@ -0,0 +1,72 @@
+import argparse
+import sys
+from DatabaseManager import DatabaseManager
+
+# Averages computed straight from Stats, to compare with the running totals
+DIRECT_QUERIES = {
+    "overall": "SELECT NULL, AVG(AvgReadingSpeed), AVG(AvgAccuracy) FROM Stats",
+    "per student": '''SELECT StudentID, AVG(AvgReadingSpeed), AVG(AvgAccuracy) FROM Stats
+        WHERE StudentID IS NOT NULL GROUP BY StudentID''',
+    "per student per day": '''SELECT StudentID || ' ' || Date, AVG(AvgReadingSpeed), AVG(AvgAccuracy) FROM Stats
+        WHERE StudentID IS NOT NULL AND Date IS NOT NULL GROUP BY StudentID, Date''',
+}
+ROLLUP_QUERIES = {
+    "overall": "SELECT NULL, SpeedSum / SpeedCount, AccuracySum / AccuracyCount FROM StatsOverall",
+    "per student": "SELECT StudentID, SpeedSum / SpeedCount, AccuracySum / AccuracyCount FROM StatsByStudent",
+    "per student per day": '''SELECT StudentID || ' ' || Date, SpeedSum / SpeedCount, AccuracySum / AccuracyCount
+        FROM StatsByStudentDay''',
+}
+
+
+def find_drift(db_manager, tolerance=1e-6):
+    """
+    Compare the running totals with averages computed from every Stats row.
+
+    Args:
+        db_manager (DatabaseManager): Connection to READ_Database.db.
+        tolerance (float): Largest difference in an average that is not reported.
+
+    Returns:
+        list: A message for each average that differs.
+    """
+    def close(a, b):
+        if a is None or b is None:
+            return a is None and b is None
+        return abs(a - b) <= tolerance
+
+    drift = []
+    for level, direct_query in DIRECT_QUERIES.items():
+        direct = {key: values for key, *values in db_manager.cursor.execute(direct_query).fetchall()}
+        rollup = {key: values for key, *values in db_manager.cursor.execute(ROLLUP_QUERIES[level]).fetchall()}
+        for key in direct.keys() | rollup.keys():
+            expected, actual = direct.get(key, [None, None]), rollup.get(key, [None, None])
+            if not all(close(a, b) for a, b in zip(expected, actual)):
+                name = f"{level} {key}" if key else level
+                drift.append(f"{name}: totals give {actual}, Stats gives {expected}")
+    return drift
+
+
+def main():
+    """Rebuild the stats totals from Stats, or check them against it."""
+    parser = argparse.ArgumentParser(description="Rebuild the running stats totals from every session in Stats.")
+    parser.add_argument("--check", action="store_true", help="Only report totals that differ from Stats")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager()
+    if args.check:
+        drift = find_drift(db_manager)
+        for message in drift:
+            print(message)
+        print(f"{len(drift)} totals differ from Stats")
+        db_manager.close_connection()
+        sys.exit(1 if drift else 0)
+
+    if not db_manager.rebuild_stats_rollups():
+        sys.exit(1)
+    sessions = db_manager.cursor.execute("SELECT Sessions FROM StatsOverall").fetchone()[0]
+    print(f"Rebuilt the stats totals from {sessions} sessions")
+    db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    main()
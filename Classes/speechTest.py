@@ -1,42 +1,67 @@
 import os
 import warnings
 import logging
-import transformers
-import Levenshtein
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import difflib
-from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
-import torch
-from phonemizer import phonemize
-import librosa
-import numpy as np
+from ModelRegistry import ModelRegistry
+from PhonemizerService import PhonemizerService
+from PhonemeAligner import PhonemeAligner, PHONEME_SIMILARITY
 
 #Suppress warnings and logs
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
 os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
 warnings.filterwarnings("ignore")
-transformers.logging.set_verbosity_error()
 logging.basicConfig(level=logging.CRITICAL)
 
-# Load the pre-trained model and processor
-model = Wav2Vec2ForCTC.from_pretrained("facebook/wav2vec2-xlsr-53-espeak-cv-ft")
-processor = Wav2Vec2Processor.from_pretrained("facebook/wav2vec2-xlsr-53-espeak-cv-ft")
+def __getattr__(name):
+    """Lazily expose the shared model and processor as module attributes."""
+    if name == "model":
+        return ModelRegistry.get_model()
+    if name == "processor":
+        return ModelRegistry.get_processor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-def improved_phoneme_comparison(expected_text: str, recorded_phonemes: str) -> List[Tuple[str, float]]:
+_aligner = PhonemeAligner()
+
+
+def improved_phoneme_comparison(expected_text: str, recorded_phonemes: str, expected_phonemes: Optional[str] = None) -> List[Tuple[str, float]]:
     """
     Compare the expected text with recorded phonemes and calculate similarity scores.
 
+    The whole sentence is aligned once with a weighted edit distance, and each word
+    is scored on the part of the recording aligned with its phonemes.
+
     Args:
         expected_text (str): The expected text.
         recorded_phonemes (str): The phonemes from the recorded audio.
+        expected_phonemes (str, optional): Precomputed phonemes of the expected text.
+            Phonemized with espeak if not given.
 
     Returns:
         List[Tuple[str, float]]: A list of tuples containing words and their similarity scores.
     """
-    expected_phonemes = phonemize(expected_text, language='en-us', backend='espeak', 
-                                  strip=True, preserve_punctuation=False, with_stress=False)
+    if expected_phonemes is None:
+        expected_phonemes = PhonemizerService.phonemize(expected_text, language='en-us')
+    return _aligner.word_scores(expected_text.split(), expected_phonemes.split(), ''.join(recorded_phonemes.split()))
+
+def difflib_phoneme_comparison(expected_text: str, recorded_phonemes: str, expected_phonemes: Optional[str] = None) -> List[Tuple[str, float]]:
+    """
+    Score words the original way, with difflib matching blocks and flexible_match.
+
+    Kept as a baseline for benchmarkAlignment.py.
+
+    Args:
+        expected_text (str): The expected text.
+        recorded_phonemes (str): The phonemes from the recorded audio.
+        expected_phonemes (str, optional): Precomputed phonemes of the expected text.
+
+    Returns:
+        List[Tuple[str, float]]: A list of tuples containing words and their similarity scores.
+    """
+    if expected_phonemes is None:
+        expected_phonemes = PhonemizerService.phonemize(expected_text, language='en-us')
     
     recorded_phonemes_list = recorded_phonemes.split()
     expected_words = expected_text.split()
@@ -101,14 +126,6 @@ def flexible_match(expected: List[str], recorded: str) -> float:
     Returns:
         float: The similarity score between expected and recorded phonemes.
     """
-    similarity_matrix = {
-        ('a', 'ɐ'): 0.9, ('i', 'ɪ'): 0.9, ('u', 'ʊ'): 0.9,
-        ('e', 'ɛ'): 0.9, ('o', 'ɔ'): 0.9, ('ə', 'ʌ'): 0.9,
-        ('d', 't'): 0.8, ('b', 'p'): 0.8, ('g', 'k'): 0.8,
-        ('m', 'n'): 0.8, ('f', 'v'): 0.8, ('s', 'z'): 0.8,
-        ('r', 'l'): 0.7, ('ʃ', 's'): 0.7, ('θ', 'f'): 0.7,
-    }
-
     score = 0
     expected_len = len(expected)
     recorded_len = len(recorded)
@@ -119,12 +136,12 @@ def flexible_match(expected: List[str], recorded: str) -> float:
             score += 1
             i += 1
             j += 1
-        elif (expected[i], recorded[j]) in similarity_matrix:
-            score += similarity_matrix[(expected[i], recorded[j])]
+        elif (expected[i], recorded[j]) in PHONEME_SIMILARITY:
+            score += PHONEME_SIMILARITY[(expected[i], recorded[j])]
             i += 1
             j += 1
-        elif (recorded[j], expected[i]) in similarity_matrix:
-            score += similarity_matrix[(recorded[j], expected[i])]
+        elif (recorded[j], expected[i]) in PHONEME_SIMILARITY:
+            score += PHONEME_SIMILARITY[(recorded[j], expected[i])]
             i += 1
             j += 1
         else:
@@ -136,29 +153,58 @@ def flexible_match(expected: List[str], recorded: str) -> float:
     
     return score / max(expected_len, recorded_len)
 
+def build_feedback(word_scores: List[Tuple[str, float]], expected_words: List[str], threshold: float = 0.6) -> List[dict]:
+    """
+    Build a structured result for every expected word, in linear time.
+
+    Scores are matched to words by position, so a word that appears several times
+    gets the score of each occurrence. A whole story can be handled in one call by
+    concatenating its sentences' word scores and words.
+
+    Args:
+        word_scores (List[Tuple[str, float]]): Words and their similarity scores, in reading order.
+        expected_words (List[str]): List of expected words.
+        threshold (float, optional): Threshold for considering a word as correctly pronounced. Defaults to 0.6.
+
+    Returns:
+        List[dict]: For each expected word, its "index", "word", "score" (None if it was not
+        scored) and "status": "correct", "mispronounced" or "missing".
+    """
+    results = []
+    for index, word in enumerate(expected_words):
+        score = None
+        if index < len(word_scores) and word_scores[index][0] == word:
+            score = word_scores[index][1]
+
+        if score is None:
+            status = "missing"
+        elif score < threshold:
+            status = "mispronounced"
+        else:
+            status = "correct"
+        results.append({"index": index, "word": word, "score": score, "status": status})
+    return results
+
 def provide_feedback(word_scores: List[Tuple[str, float]], expected_words: List[str], threshold: float = 0.6) -> str:
     """
     Provide feedback on pronunciation based on word scores.
 
     Args:
         word_scores (List[Tuple[str, float]]): List of tuples containing words and their similarity scores.
-        expected_words (List[str]): List of expected words.
+        expected_words (List[str]): List of expected words. A string is split into words.
         threshold (float, optional): Threshold for considering a word as correctly pronounced. Defaults to 0.6.
 
     Returns:
         str: Feedback string containing information about each word's pronunciation.
     """
-    feedback = []
-    scored_words = set(word for word, _ in word_scores)
-    
-    for word in expected_words:
-        if word in scored_words:
-            score = next(score for w, score in word_scores if w == word)
-            if score < threshold:
-                feedback.append(f"The word '{word}' may have been mispronounced (confidence: {score:.2f}).")
-            else:
-                feedback.append(f"The word '{word}' was pronounced correctly (confidence: {score:.2f}).")
-        else:
-            feedback.append(f"The word '{word}' was not detected in the recording).")
-    
-    return "\n".join(feedback)
+    if isinstance(expected_words, str):
+        expected_words = expected_words.split()
+
+    messages = {
+        "mispronounced": "The word '{word}' may have been mispronounced (confidence: {score:.2f}).",
+        "correct": "The word '{word}' was pronounced correctly (confidence: {score:.2f}).",
+        "missing": "The word '{word}' was not detected in the recording.",
+    }
+    return "\n".join(
+        messages[result["status"]].format(**result) for result in build_feedback(word_scores, expected_words, threshold)
+    )
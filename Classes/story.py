@@ -1,3 +1,22 @@
+import re
+
+# Sentences end at '.', '!' or '?' followed by spaces, as shown one at a time in a ReadingSession
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?]) +')
+
+
+def split_sentences(text):
+    """
+    Split a story body into the sentences a student reads one at a time.
+
+    Args:
+        text (str): The story body.
+
+    Returns:
+        list: The sentences, in order.
+    """
+    return SENTENCE_BOUNDARY.split(text)
+
+
 class Story:
     
     def __init__(self,storyID,title,difficultyLevel):